@@ -20,6 +20,7 @@ Implements basic functionality of establishing connection, subscription on conne
 handle various MQTT versions
 """
 
+import functools
 import json
 import logging
 import re
@@ -334,11 +335,13 @@ class UnsMQTTClient(mqtt_client.Client):
         return resulting_message
 
     @staticmethod
+    @functools.lru_cache(maxsize=4096)
     def is_topic_matched(topic_with_wildcard: str, topic: str) -> bool:
         """
         Checks if the actual topic matches with a wild card expression
         e.g. "a/b" matches with "a/+" and "a/#"
              "a/b/c" matches wit "a/#" but not with "a/+"
+        The result is cached as it is checked for every message while the set of topics is mostly stable
         """
         if topic_with_wildcard is not None:
             regex_exp = UnsMQTTClient.get_regex_for_topic_with_wildcard(topic_with_wildcard)
@@ -346,6 +349,7 @@ class UnsMQTTClient(mqtt_client.Client):
         return False
 
     @staticmethod
+    @functools.lru_cache(maxsize=1024)
     def get_regex_for_topic_with_wildcard(topic_with_wildcard) -> str:
         regex_list = topic_with_wildcard.split("/")
         # Using Regex to do matching
@@ -136,7 +136,7 @@ def convert_dict_to_metric(metric_dict: dict) -> Payload.Metric:
 
                     case _:
                         # All other value types
-                        SPBMetricDataTypes(datatype).set_value_in_sparkplug(value, metric)
+                        datatype.set_value_in_sparkplug(value, metric)
                 # end of match for value
             case "properties":
                 metric.properties.CopyFrom(convert_dict_to_propertyset(value))
@@ -253,10 +253,9 @@ class SpBMessageGenerator:
         Helper method for getting the next sequence number
         """
         ret_val = self.msg_seq_number
-        LOGGER.debug("Sequence Number:%s", str(ret_val))
-        self.msg_seq_number += 1
-        if self.msg_seq_number == 256:
-            self.msg_seq_number = 0
+        LOGGER.debug("Sequence Number:%s", ret_val)
+        # wraps to 0 after 255
+        self.msg_seq_number = (ret_val + 1) & 0xFF
         return ret_val
 
     def get_birth_seq_num(self):
@@ -264,10 +263,9 @@ class SpBMessageGenerator:
         Helper method for getting the next birth/death sequence number
         """
         ret_val = self.birth_death_seq_num
-        LOGGER.debug("Birth/Death Sequence Number:%s", str(ret_val))
-        self.birth_death_seq_num += 1
-        if self.birth_death_seq_num == 256:
-            self.birth_death_seq_num = 0
+        LOGGER.debug("Birth/Death Sequence Number:%s", ret_val)
+        # wraps to 0 after 255
+        self.birth_death_seq_num = (ret_val + 1) & 0xFF
         return ret_val
 
     def get_node_death_payload(self, payload: Payload = None) -> Payload:
@@ -560,20 +558,26 @@ class SpBMessageGenerator:
         metric.dataset_value.num_of_columns = len(types)
         metric.dataset_value.columns.extend(columns)
         metric.dataset_value.types.extend(types)
+        # resolve the column datatypes once for all rows
+        column_types: list[SPBDataSetDataTypes] = [SPBDataSetDataTypes(cell_type) for cell_type in types]
         for row in rows:
-            self._add_row_to_dataset(dataset_value=metric.dataset_value, values=row)
+            self._add_row_to_dataset(dataset_value=metric.dataset_value, values=row, column_types=column_types)
 
         return metric.dataset_value
 
-    def _add_row_to_dataset(self, dataset_value: Payload.DataSet, values: list[int | float | bool | str]):
+    def _add_row_to_dataset(
+        self,
+        dataset_value: Payload.DataSet,
+        values: list[int | float | bool | str],
+        column_types: list[SPBDataSetDataTypes],
+    ):
         """
         Private Helper method to set the row in the the dataset
+        column_types are the datatypes of the dataset columns already resolved to SPBDataSetDataTypes
         """
         ds_row = dataset_value.rows.add()
-        types = dataset_value.types
-        for cell_value, cell_type in zip(values, types):
-            ds_element = ds_row.elements.add()
-            SPBDataSetDataTypes(cell_type).set_value_in_sparkplug(value=cell_value, spb_object=ds_element)
+        for cell_value, cell_type in zip(values, column_types):
+            cell_type.set_value_in_sparkplug(value=cell_value, spb_object=ds_row.elements.add())
 
     def init_template_metric(
         self,
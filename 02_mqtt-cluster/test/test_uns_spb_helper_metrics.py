@@ -86,6 +86,10 @@ def create_dummy_dataset() -> Payload.DataSet:
     return data_set
 
 
+# created once and shared by the parametrized test cases, like DUMMY_PROPERTY_SET
+DUMMY_DATASET: Payload.DataSet = create_dummy_dataset()
+
+
 @pytest.fixture(autouse=True)
 def setup_alias_map():
     # clear the alias map for each test
@@ -304,7 +308,7 @@ def _convert_to_unsigned_int(value: int, factor: Literal[0, 8, 16, 32, 64]) -> i
                     "name": "Inputs/dataset",
                     "timestamp": 1486144502122,
                     "datatype": SPBMetricDataTypes.DataSet,
-                    "value": create_dummy_dataset(),
+                    "value": DUMMY_DATASET,
                 },
             ],
         ),
@@ -574,7 +578,7 @@ def test_add_metric_and_ddata_msg(timestamp: float, metrics: list[dict]):
                 "name": "Inputs/dataset",
                 "timestamp": 1486144502122,
                 "datatype": SPBMetricDataTypes.DataSet,
-                "value": create_dummy_dataset(),
+                "value": DUMMY_DATASET,
                 # TODO Template
             },
         ],
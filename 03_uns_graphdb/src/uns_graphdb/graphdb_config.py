@@ -96,6 +96,8 @@ class GraphDBConfig:
         settings.get("graphdb.spB_node_types", ("spBv1_0", "GROUP", "MESSAGE_TYPE", "EDGE_NODE", "DEVICE"))
     )
     nested_attributes_node_type: str = settings.get("graphdb.nested_attribute_node_type", "NESTED_ATTRIBUTE")
+    # maximum number of messages written concurrently, each with its own session. the MQTT client waits when all are in use
+    max_concurrent_writes: int = settings.get("graphdb.max_concurrent_writes", 8)
 
     if db_url is None:
         LOGGER.error(
@@ -18,6 +18,8 @@
 Class responsible for persisting the MQTT message into the Graph Database
 """
 
+import asyncio
+import functools
 import logging
 import re
 import sys
@@ -41,11 +43,134 @@ REL_ATTR_TYPE = "type"
 REL_INDEX = "index"
 
 SANITIZE_PATTERN = r"[^A-Za-z0-9_]"  # used to sanitize fields sent to Neo4j which cant be sent as params
+# tuple instead of the union list | tuple, which is rebuilt every time the expression is evaluated
+_SEQUENCE_TYPES = (list, tuple)
+
+
+@functools.lru_cache(maxsize=64)
+def _build_save_node_query(nodetype: str, literal_map: str) -> str:
+    """
+    Builds the CQL query used by `GraphDBHandler.save_node`.
+    Node labels and relationship properties can't be sent as parameters to Neo4j, hence they are
+    interpolated into the query. The query is cached so that the same text is reused for every
+    node of the same type, avoiding rebuilding the string and letting Neo4j reuse the query plan
+
+    Parameters
+    ----------
+    nodetype : str
+        The label of the node to be created/merged. Expected to be already sanitized
+    literal_map : str
+        The relationship properties as a CQL literal map. see `GraphDBHandler.get_literal_map`
+    """
+    return f"""//Find Parent node
+OPTIONAL MATCH (parent) WHERE elementId(parent) = $parent_id
+// Optional match the child node
+OPTIONAL MATCH (parent) -[r:{NODE_RELATION_NAME} {literal_map} ]-> (child:{nodetype}{{ node_name: $nodename}})
+
+// Use apoc.do.when to handle the case where parent is null
+CALL apoc.do.when(
+    // Check if the child is null
+    parent is null,
+    "
+    MERGE (new_node:{nodetype} {{ node_name: $nodename }})
+    SET new_node.{CREATED_TIMESTAMP_KEY} = $timestamp
+    SET new_node += $attributes
+    RETURN new_node as child
+    ",
+    "
+    CALL apoc.do.when(
+        // Check if the child is nulls
+        child is null,
+        // Create a new node when the child is null
+        'CREATE (new_node:{nodetype} {{ node_name: $nodename }})
+        SET new_node.{CREATED_TIMESTAMP_KEY} = $timestamp
+        SET new_node += $attributes
+        MERGE (parent)-[r:{NODE_RELATION_NAME} {literal_map.replace('"', r'\"')} ]-> (new_node)
+        // Return the new child node, parent node
+        RETURN new_node as child, parent as parent
+        ',
+        // Modify the existing child node when it is not null
+        'SET child.{MODIFIED_TIMESTAMP_KEY} = $timestamp
+        SET child += $attributes
+        RETURN child as child, parent as parent
+        ',
+        // Pass in the variables
+        {{parent:parent, child:child, nodename:$nodename,
+         timestamp:$timestamp, attributes:$attributes}}
+        ) YIELD value as result
+
+    // Return the child node and the parent node
+    RETURN result.child as child, result.parent as parent
+    ",
+    // Pass in the variables
+    {{parent:parent, child:child, nodename:$nodename,
+      timestamp:$timestamp, attributes:$attributes}}
+    ) YIELD value
+// return the child node
+RETURN value.child
+"""
+
+
+@functools.lru_cache(maxsize=64)
+def _build_save_topic_path_query(path_node_types: tuple) -> str:
+    """
+    Builds the CQL query used by `GraphDBHandler.save_topic_path`.
+    Each entry in path_node_types is merged as a child of the previous node, the node names are
+    passed as the parameter list `$path`. The properties in `$attributes` are set on the last node.
+    Returns the elementId of the last node in the path
+
+    Parameters
+    ----------
+    path_node_types : tuple
+        The label of each node in the path. Expected to be already sanitized
+    """
+    query = f"""MERGE (n0:{path_node_types[0]} {{ node_name: $path[0] }})
+SET n0.{CREATED_TIMESTAMP_KEY} = $timestamp
+"""
+    for depth in range(1, len(path_node_types)):
+        node = f"n{depth}:{path_node_types[depth]} {{ node_name: $path[{depth}] }}"
+        query = (
+            query
+            + f"""MERGE (n{depth - 1})-[:{NODE_RELATION_NAME}]->({node})
+ON CREATE SET n{depth}.{CREATED_TIMESTAMP_KEY} = $timestamp
+ON MATCH SET n{depth}.{MODIFIED_TIMESTAMP_KEY} = $timestamp
+"""
+        )
+    last_node = f"n{len(path_node_types) - 1}"
+    return query + f"SET {last_node} += $attributes\nRETURN elementId({last_node})"
+
+
+@functools.lru_cache(maxsize=64)
+def _build_save_attribute_nodes_query(nodetype: str, rel_keys: tuple) -> str:
+    """
+    Builds the CQL query used by `GraphDBHandler.save_nested_attribute_nodes`.
+    Merges every row in the parameter list `$rows` as a child node of the node with elementId `row.parent_id`
+    Returns the `row_id` of each row with the elementId of the merged node
+
+    Parameters
+    ----------
+    nodetype : str
+        The label of the nodes to be created/merged. Expected to be already sanitized
+    rel_keys : tuple
+        The keys of the relationship properties, values are passed in `row.rel`. Expected to be already sanitized
+    """
+    rel_map = ""
+    if len(rel_keys) > 0:
+        rel_map = "{ " + ", ".join(f"{key}: row.rel.{key}" for key in rel_keys) + " }"
+    return f"""UNWIND $rows AS row
+MATCH (parent) WHERE elementId(parent) = row.parent_id
+MERGE (parent)-[:{NODE_RELATION_NAME} {rel_map}]->(child:{nodetype} {{ node_name: row.node_name }})
+ON CREATE SET child.{CREATED_TIMESTAMP_KEY} = $timestamp
+ON MATCH SET child.{MODIFIED_TIMESTAMP_KEY} = $timestamp
+SET child += row.attributes
+RETURN row.row_id AS row_id, elementId(child) AS child_id
+"""
 
 
 class GraphDBHandler:
     """
     Class responsible for persisting the MQTT message into the Graph Database
+    Uses the Neo4j async driver, hence all methods interacting with the database are coroutines
     """
 
     def __init__(
@@ -84,94 +209,129 @@ class GraphDBHandler:
             self.database = neo4j.DEFAULT_DATABASE
         self.max_retry: int = max_retry
         self.sleep_btw_attempts: int = sleep_btw_attempts
-        self.driver: neo4j.Driver = None
-        try:
-            self.connect()
-
-        except SystemError as ex:
-            raise ex
-        except Exception as ex:
-            LOGGER.error("Failed to create the driver: %s", str(ex), stack_info=True, exc_info=True)
-            raise SystemError(ex) from ex
-
-    def connect(self, retry: int = 0) -> neo4j.Driver:
+        # the async driver is created on first use. see `GraphDBHandler.connect`
+        self.driver: neo4j.AsyncDriver = None
+        # idle sessions reused across messages. see `GraphDBHandler.get_session`
+        self.sessions: list[neo4j.AsyncSession] = []
+        # node types for which the index on node_name has already been created
+        self.indexed_node_types: set[str] = set()
+
+    async def connect(self) -> neo4j.AsyncDriver:
         """
-        Returns Neo4j Driver which is the connection to the database
+        Returns Neo4j async Driver which is the connection to the database
         Validates if the current driver is still connected and if not will create a new connection
-
-        Parameters
-        ----------
-        retry: int
-            Optional parameters to retry making a connection in case of errors.
+        In case of errors, the connection is retried
             The max number of retry is `GraphDBHandler.max_retry`
             The time between attempts is  `GraphDBHandler.sleep_btw_attempts`
+
         Returns:
-            neo4j.Driver: The Neo4j driver object.
+            neo4j.AsyncDriver: The Neo4j async driver object.
 
         Raises
         ------
-            neo4j.exceptions.DatabaseError: When there is a general error from the database.
-            neo4j.exceptions.TransientError: When there is a problem connecting to the database.
-            neo4j.exceptions.DatabaseUnavailable: When the database is unavailable.
-            neo4j.exceptions.ServiceUnavailable: When the service is unavailable.
+            SystemError: When the connection could not be made after `GraphDBHandler.max_retry` attempts
+                         or when the error is not one that can be retried
         """
-        try:
-            if self.driver is None:
-                self.driver = neo4j.GraphDatabase.driver(self.uri, auth=self.auth, database=self.database)
-            self.driver.verify_connectivity()
-        except (
-            exceptions.DatabaseError,
-            exceptions.TransientError,
-            exceptions.DatabaseUnavailable,
-            exceptions.ServiceUnavailable,
-        ) as ex:
-            if retry >= self.max_retry:
-                LOGGER.error("No. of retries exceeded %s", str(self.max_retry), stack_info=True, exc_info=True)
+        for attempt in range(self.max_retry + 1):
+            try:
+                if self.driver is None:
+                    self.driver = neo4j.AsyncGraphDatabase.driver(self.uri, auth=self.auth, database=self.database)
+                await self.driver.verify_connectivity()
+                return self.driver
+            except (  # noqa: PERF203
+                exceptions.DatabaseError,
+                exceptions.TransientError,
+                exceptions.DatabaseUnavailable,
+                exceptions.ServiceUnavailable,
+            ) as ex:
+                if attempt >= self.max_retry:
+                    LOGGER.error(
+                        "Error Connecting to %s. No. of retries exceeded %s. Error: %s",
+                        self.database,
+                        self.max_retry,
+                        ex,
+                        stack_info=True,
+                        exc_info=True,
+                    )
+                    raise SystemError(ex) from ex
+                # stack is logged only on the final failure to keep the retries cheap
+                LOGGER.warning("Error Connecting to %s attempt %d: %s", self.database, attempt, ex)
+                await asyncio.sleep(self.sleep_btw_attempts)
+
+            except Exception as ex:
+                LOGGER.error(
+                    "Error Connecting to %s. Unable to retry. Error: %s",
+                    self.database,
+                    ex,
+                    stack_info=True,
+                    exc_info=True,
+                )
                 raise SystemError(ex) from ex
 
-            retry += 1
-            LOGGER.error("Error Connecting to %s.\n Error: %s", self.database, str(ex), stack_info=True, exc_info=True)
-            time.sleep(self.sleep_btw_attempts)
-            self.connect(retry=retry)
+    async def get_session(self) -> neo4j.AsyncSession:
+        """
+        Returns a Neo4j session to persist a message, reusing an idle session instead of opening a new session per message.
+        A session must not be used concurrently, hence each message being persisted concurrently gets its own session.
+        The session must be handed back with `GraphDBHandler.release_session` once the message is persisted
+        """
+        if self.sessions:
+            return self.sessions.pop()
+        driver = await self.connect()
+        return driver.session(database=self.database)
 
+    def release_session(self, session: neo4j.AsyncSession):
+        """
+        Returns the session to the idle sessions for reuse by the next message
+        """
+        self.sessions.append(session)
+
+    @staticmethod
+    async def discard_session(session: neo4j.AsyncSession):
+        """
+        Closes a session which failed instead of reusing it
+        """
+        try:
+            await session.close()
         except Exception as ex:
-            LOGGER.error(
-                "Error Connecting to %s. Unable to retry. Error: %s", self.database, str(ex), stack_info=True, exc_info=True
-            )
-            raise SystemError(ex) from ex
-        return self.driver
+            # pylint: disable=broad-exception-caught
+            LOGGER.error("Failed to close the session:%s", ex, stack_info=True, exc_info=True)
 
-    def close(self):
+    async def close(self):
         """
-        Closes the connection to the graph database
+        Closes the idle sessions and the connection to the graph database
         """
+        while self.sessions:
+            await self.discard_session(self.sessions.pop())
+
         if self.driver is not None:
             try:
-                self.driver.close()
+                await self.driver.close()
                 self.driver = None
             except Exception as ex:
                 # pylint: disable=broad-exception-caught
-                LOGGER.error("Failed to close the driver:%s", str(ex), stack_info=True, exc_info=True)
+                LOGGER.error("Failed to close the driver:%s", ex, stack_info=True, exc_info=True)
                 self.driver = None
 
-    def persist_mqtt_msg(
+    async def persist_mqtt_msg(
         self,
         topic: str,
         message: dict,
-        timestamp: float = time.time(),
+        timestamp: Optional[float] = None,
         node_types: tuple = ("ENTERPRISE", "FACILITY", "AREA", "LINE", "DEVICE"),
         attr_node_type: Optional[str] = "NESTED_ATTRIBUTE",
-        retry: int = 0,
     ):
         """
         Persists all nodes and the message as attributes to the leaf node
+        In case of transient errors, the transaction is retried
+            The max number of retry is `GraphDBHandler.max_retry`
+            The time between attempts is  `GraphDBHandler.sleep_btw_attempts`
         ----------
         topic: str
             The topic on which the message was sent
         message: dict
             The JSON MQTT message payload in dict format
         timestamp : float, optional
-            Timestamp for receiving the message, by default `time.time()`
+            Timestamp for receiving the message, by default the current time
         node_types : tuple, optional
             tuple of names given to nodes based on the hierarchy of the topic.
             By default `("ENTERPRISE", "FACILITY", "AREA","LINE", "DEVICE")`
@@ -179,34 +339,80 @@ class GraphDBHandler:
             Node type used to depict nested attributes which will be child nodes
             by default `"NESTED_ATTRIBUTE"`
         """
-        try:
-            driver = self.connect(retry)
-            with driver.session(database=self.database) as session:
-                session.execute_write(self.save_all_nodes, topic, message, timestamp, node_types, attr_node_type)
-        except (exceptions.TransientError, exceptions.TransactionError, exceptions.SessionExpired) as ex:
-            if retry >= self.max_retry:
-                LOGGER.error("No. of retries exceeded %s", str(self.max_retry), stack_info=True, exc_info=True)
-                raise ex
-
-            retry += 1
-            LOGGER.error(
-                "Error persisting \ntopic:%s \nmessage %s. on Error: %s",
-                topic,
-                str(message),
-                str(ex),
-                stack_info=True,
-                exc_info=True,
-            )
-            # reset the driver
-            self.close()
-            time.sleep(self.sleep_btw_attempts)
-            self.persist_mqtt_msg(
-                topic=topic, message=message, timestamp=timestamp, attr_node_type=attr_node_type, retry=retry
-            )
+        if timestamp is None:
+            timestamp = time.time()
+        node_types_in_msg: set[str] = {
+            GraphDBHandler.get_topic_node_type(depth, node_types)
+            for depth in range(len(GraphDBHandler.get_topic_levels(topic)))
+        }
+        if attr_node_type is not None:
+            node_types_in_msg.add(attr_node_type)
+        for attempt in range(self.max_retry + 1):
+            session = await self.get_session()
+            try:
+                await self.create_node_indexes(session, node_types_in_msg)
+                await session.execute_write(self.save_all_nodes, topic, message, timestamp, node_types, attr_node_type)
+                self.release_session(session)
+                return
+            except (
+                exceptions.TransientError,
+                exceptions.TransactionError,
+                exceptions.SessionExpired,
+                exceptions.DatabaseUnavailable,
+                exceptions.ServiceUnavailable,
+            ) as ex:
+                await self.discard_session(session)
+                if attempt >= self.max_retry:
+                    LOGGER.error(
+                        "Error persisting topic:%s message:%r. No. of retries exceeded %s. Error: %s",
+                        topic,
+                        message,
+                        self.max_retry,
+                        ex,
+                        stack_info=True,
+                        exc_info=True,
+                    )
+                    raise
+
+                # stack is logged only on the final failure to keep the retries cheap
+                LOGGER.warning("Error persisting topic:%s attempt %d: %s", topic, attempt, ex)
+                await asyncio.sleep(self.sleep_btw_attempts)
+            except Exception:
+                await self.discard_session(session)
+                raise
 
     # method  starts
-    def save_all_nodes(
-        self, session: neo4j.Session, topic: str, message: dict, timestamp: float, node_types: tuple, attr_node_type: str
+    async def create_node_indexes(self, session: neo4j.AsyncSession, node_types: set[str]):
+        """
+        Creates an index on node_name for each node type which hasn't been indexed by this handler yet
+        Every node is merged by matching on its node type and node_name, hence without the index Neo4j
+        has to scan all nodes of that type.
+        node_name is unique only within the parent node hence a uniqueness constraint is not used
+
+        Parameters
+        ----------
+        session : neo4j.AsyncSession
+            The Neo4j session. Schema changes can't be done in the same transaction as the data changes
+        node_types : set[str]
+            The node types for which the index should exist
+        """
+        for node_type in node_types - self.indexed_node_types:
+            result: neo4j.AsyncResult = await session.run(
+                f"CREATE INDEX IF NOT EXISTS FOR (n:{node_type}) ON (n.{NODE_NAME_KEY})"
+            )
+            await result.consume()
+            self.indexed_node_types.add(node_type)
+
+    # method Ends
+
+    async def save_all_nodes(
+        self,
+        session: neo4j.AsyncManagedTransaction,
+        topic: str,
+        message: dict,
+        timestamp: float,
+        node_types: tuple,
+        attr_node_type: str,
     ):
         """
         Iterate the topics by '/'. create node for each level & merge the messages to the final node
@@ -228,44 +434,141 @@ class GraphDBHandler:
         attr_node_type : str
             The node type for attribute nodes
         """
-        response = None
-        count: int = 0
-        lastnode_id = None
-        nodes = topic.split("/")
-
-        for node in nodes:
-            LOGGER.debug("Processing sub topic: %s of topic:%s", str(node), str(topic))
-            node_type: str = GraphDBHandler.get_topic_node_type(count, node_types)
-            if node != nodes[-1]:  # check if this is the leaf node of the topic
-                response = GraphDBHandler.save_node(
-                    session=session,
-                    nodename=node,
-                    nodetype=node_type,
-                    node_props=None,
-                    parent_id=lastnode_id,
-                    timestamp=timestamp,
+        nodes = GraphDBHandler.get_topic_levels(topic)
+        if len(nodes) == 0:
+            raise ValueError(f"Topic: {topic} has no levels to be persisted")
+        path_node_types = tuple(GraphDBHandler.get_topic_node_type(depth, node_types) for depth in range(len(nodes)))
+        primitive_properties, compound_properties = GraphDBHandler.separate_plain_composite_attributes(message)
+        if len(primitive_properties) == 0 and len(compound_properties) == 0:
+            # Dont create empty leaf node, only the intermediate levels of the topic
+            await GraphDBHandler.save_topic_path(
+                session=session, path=list(nodes[:-1]), path_node_types=path_node_types[:-1], timestamp=timestamp
+            )
+            return
+        # all levels of the topic including the leaf with its primitive attributes are merged in one query
+        leaf_node_id = await GraphDBHandler.save_topic_path(
+            session=session,
+            path=list(nodes),
+            path_node_types=path_node_types,
+            timestamp=timestamp,
+            attributes=primitive_properties,
+        )
+        # the nested attributes then are saved as child nodes of the leaf
+        await GraphDBHandler.save_nested_attribute_nodes(
+            session=session,
+            attr_nodes=GraphDBHandler.get_child_attribute_nodes(compound_properties, leaf_node_id, attr_node_type),
+            attr_node_type=attr_node_type,
+            timestamp=timestamp,
+        )
+
+    # method Ends
+
+    # static method starts
+    @staticmethod
+    async def save_topic_path(
+        session: neo4j.AsyncManagedTransaction,
+        path: list[str],
+        path_node_types: tuple,
+        timestamp: float,
+        attributes: Optional[dict] = None,
+    ) -> Optional[str]:
+        """
+        Creates or Merges the levels of the topic as a chain of nodes
+        with a single query, instead of one query per level
+
+        Parameters
+        ----------
+        session  : neo4j.AsyncManagedTransaction
+            Neo4j transaction object
+        path : list[str]
+            The levels of the topic
+        path_node_types : tuple
+            The node type for each level in `path`
+        timestamp : float
+            timestamp for receiving the message
+        attributes : dict, optional
+            primitive properties to be set on the last node of the path
+
+        Returns
+        -------
+        The elementId of the last node in the path or None if the path is empty
+        """
+        if len(path) == 0:
+            return None
+
+        query = _build_save_topic_path_query(path_node_types)
+        if LOGGER.isEnabledFor(logging.DEBUG):
+            LOGGER.debug("Saving topic path: %s with CQL statement: %s", path, query)
+
+        result: neo4j.AsyncResult = await session.run(
+            query,
+            path=path,
+            timestamp=timestamp,
+            attributes=GraphDBHandler.transform_node_params_for_neo4j(attributes),
+        )
+        record = await result.single()
+        return record[0]
+
+    # static method Ends
+
+    # static method starts
+    @staticmethod
+    def get_child_attribute_nodes(
+        compound_properties: dict, parent_id: Optional[str], attr_node_type: str
+    ) -> list[tuple[str, str, Optional[str], dict, dict]]:
+        """
+        Get the child nodes to be created for the composite attributes of a node
+
+        Parameters
+        ----------
+        compound_properties (dict): composite attributes as returned by `separate_plain_composite_attributes`
+        parent_id (str): The element_id of the node to which the composite attributes belong
+        attr_node_type (str): The type of attribute node
+
+        Returns
+        -------
+        list of (nodename, node_type, parent_id, attributes, nodetype_props) for each child node
+        """
+        children: list[tuple[str, str, Optional[str], dict, dict]] = []
+        for key, value in compound_properties.items():
+            if isinstance(value, dict):
+                # split the attributes of the nested dict into primitive and compound.
+                dict_name: str = str(value.get("name", key))
+                children.append(
+                    (dict_name, attr_node_type, parent_id, value, {REL_ATTR_KEY: key, REL_ATTR_TYPE: "dict"})
                 )
-                records = list(response)
-                lastnode_id = records[0][0].element_id
-
-            else:  # if this is the leaf node of the topic then save the attributes to this nodes
-                GraphDBHandler.save_attribute_nodes(
-                    session=session,
-                    nodename=node,
-                    lastnode_id=lastnode_id,
-                    attr_nodes=message,
-                    node_type=node_type,
-                    attr_node_type=attr_node_type,
-                    timestamp=timestamp,
+
+            elif isinstance(value, _SEQUENCE_TYPES):
+                # create/update child nodes for list of dicts to the parent node
+                # currently ignoring the index in the array as subsequent updates may not have same position
+                # value should be uniquely identified by it's name
+                for index, sub_dict in enumerate(value):
+                    # save each element as a different node.
+                    # to avoid clashes get the name of the child node sub_dict["name"] and append to the key
+                    # Not using index because the length of the array could change across invocations
+                    # if name is not present use the current index number
+                    sub_dict_name = sub_dict.get("name", key + "_" + str(index))
+                    children.append(
+                        (
+                            sub_dict_name,
+                            attr_node_type,
+                            parent_id,
+                            sub_dict,
+                            {REL_ATTR_KEY: key, REL_ATTR_TYPE: "list", REL_INDEX: index},
+                        )
+                    )
+            else:
+                LOGGER.error(
+                    "Compound Properties: %s should either be dict or a list of dict. Ignored and not persisted", value
                 )
-            count += 1
+        return children
 
-    # method Ends
+    # static method Ends
 
     # static method starts
     @staticmethod
-    def save_attribute_nodes(
-        session,
+    async def save_attribute_nodes(
+        session: neo4j.AsyncManagedTransaction,
         nodename: str,
         lastnode_id: str,
         attr_nodes: dict,
@@ -288,72 +591,112 @@ class GraphDBHandler:
         attr_node_type (str): The type of attribute node. i.e the child nodes of attribute node
         timestamp (float): The timestamp of when the attribute nodes were saved.
         """
-        primitive_properties, compound_properties = GraphDBHandler.separate_plain_composite_attributes(attr_nodes)
-        if len(primitive_properties) > 0 or len(compound_properties) > 0:  # Dont create empty node
-            response = GraphDBHandler.save_node(
-                session=session,
-                nodename=nodename,
-                nodetype=node_type,
-                node_props=primitive_properties,
-                nodetype_props=nodetype_props,
-                parent_id=lastnode_id,
-                timestamp=timestamp,
-            )
-            attr_node_id = response.peek()[0].element_id
-        else:
-            attr_node_id = lastnode_id
+        await GraphDBHandler.save_nested_attribute_nodes(
+            session=session,
+            attr_nodes=[(nodename, node_type, lastnode_id, attr_nodes, nodetype_props)],
+            attr_node_type=attr_node_type,
+            timestamp=timestamp,
+        )
 
-        for key, value in compound_properties.items():
-            if isinstance(value, dict):
-                # split the attributes of the nested dict into primitive and compound.
-                dict_name: str = str(value.get("name", key))
-                GraphDBHandler.save_attribute_nodes(
-                    session=session,
-                    nodename=dict_name,
-                    node_type=attr_node_type,
-                    attr_node_type=attr_node_type,
-                    attr_nodes=value,
-                    nodetype_props={"attribute_name": key, "type": "dict"},
-                    lastnode_id=attr_node_id,
-                    timestamp=timestamp,
-                )
+    # method Ends
 
-            elif isinstance(value, list | tuple):
-                # recursively create/update child nodes for list of dicts to the parent node
-                # currently ignoring the index in the array as subsequent updates may not have same position
-                # value should be uniquely identified by it's name
-                index: int = 0
-                for sub_dict in value:
-                    # save each element as a different node.
-                    # to avoid clashes get the name of the child node sub_dict["name"] and append to the key
-                    # Not using index because the length of the array could change across invocations
-                    # if name is not present use the current index number
-                    sub_dict_name = sub_dict.get("name", key + "_" + str(index))
+    # static method starts
+    @staticmethod
+    async def save_nested_attribute_nodes(
+        session: neo4j.AsyncManagedTransaction,
+        attr_nodes: list[tuple[str, str, Optional[str], dict, Optional[dict]]],
+        attr_node_type: str,
+        timestamp: float,
+    ):
+        """
+        Saves the attribute nodes and all their nested attribute nodes, one level of nesting at a time.
+        All nodes of a level with the same node type and relationship keys are merged with one UNWIND query
+        instead of one query per node
 
-                    GraphDBHandler.save_attribute_nodes(
+        Parameters
+        ----------
+        session: The session object to interact with the database.
+        attr_nodes (list): (nodename, node_type, parent_id, attributes, nodetype_props) for each node to be saved
+                           see `GraphDBHandler.get_child_attribute_nodes`
+        attr_node_type (str): The type of attribute node. i.e the child nodes of attribute node
+        timestamp (float): The timestamp of when the attribute nodes were saved.
+        """
+        pending = attr_nodes
+        while pending:
+            next_level: list[tuple[str, str, Optional[str], dict, Optional[dict]]] = []
+            # rows to be merged and the compound properties of each row, grouped by node type and relationship keys
+            batches: dict[tuple[str, tuple], tuple[list[dict], list[dict]]] = {}
+            for current_name, current_type, parent_id, current_attrs, current_rel_props in pending:
+                primitive_properties, compound_properties = GraphDBHandler.separate_plain_composite_attributes(
+                    current_attrs
+                )
+                if len(primitive_properties) == 0 and len(compound_properties) == 0:  # Dont create empty node
+                    continue
+                if parent_id is None:
+                    # top most node has no parent to be matched by the batch query
+                    response = await GraphDBHandler.save_node(
                         session=session,
-                        nodename=sub_dict_name,
-                        node_type=attr_node_type,
-                        lastnode_id=attr_node_id,
-                        attr_nodes=sub_dict,
-                        nodetype_props={REL_ATTR_KEY: key, REL_ATTR_TYPE: "list", REL_INDEX: index},
-                        attr_node_type=attr_node_type,
+                        nodename=current_name,
+                        nodetype=current_type,
+                        node_props=primitive_properties,
+                        nodetype_props=current_rel_props,
+                        parent_id=parent_id,
                         timestamp=timestamp,
                     )
-                    index = index + 1
-            else:
-                LOGGER.error(
-                    f"Compound Properties: {value} should either be dict or a list of dict. Ignored and not persisted"
+                    record = await response.single()
+                    next_level.extend(
+                        GraphDBHandler.get_child_attribute_nodes(compound_properties, record[0].element_id, attr_node_type)
+                    )
+                    continue
+
+                rel_props = GraphDBHandler.sanitize_relation_props(current_rel_props)
+                rows, row_compound_properties = batches.setdefault((current_type, tuple(rel_props)), ([], []))
+                rows.append(
+                    {
+                        "row_id": len(rows),
+                        "parent_id": parent_id,
+                        "node_name": current_name,
+                        "attributes": GraphDBHandler.transform_node_params_for_neo4j(primitive_properties),
+                        "rel": rel_props,
+                    }
                 )
-                pass
+                row_compound_properties.append(compound_properties)
+
+            for (current_type, rel_keys), (rows, row_compound_properties) in batches.items():
+                query = _build_save_attribute_nodes_query(current_type, rel_keys)
+                if LOGGER.isEnabledFor(logging.DEBUG):
+                    LOGGER.debug("Saving attribute nodes: %s with CQL statement: %s", rows, query)
+                result: neo4j.AsyncResult = await session.run(query, rows=rows, timestamp=timestamp)
+                async for record in result:
+                    next_level.extend(
+                        GraphDBHandler.get_child_attribute_nodes(
+                            row_compound_properties[record["row_id"]], record["child_id"], attr_node_type
+                        )
+                    )
+            pending = next_level
 
     # method Ends
 
     # static method starts
     @staticmethod
+    @functools.lru_cache(maxsize=1024)
+    def get_topic_levels(topic: str) -> tuple[str, ...]:
+        """
+        Splits the topic by '/' into its levels, skipping empty levels
+        which are caused by leading, trailing or consecutive '/' and would otherwise create nodes with an empty name
+        Results are cached as the same topics are published repeatedly
+        """
+        return tuple(level for level in topic.split("/") if level)
+
+    # static method ends
+
+    # static method starts
+    @staticmethod
+    @functools.lru_cache(maxsize=64)
     def get_topic_node_type(current_depth: int, node_types: tuple) -> str:
         """
         Get the name of the node depending on the depth in the tree
+        Results are cached as node_types is fixed by configuration, hence node_types must be hashable
         """
         if current_depth < len(node_types):
             return node_types[current_depth]
@@ -364,14 +707,14 @@ class GraphDBHandler:
 
     # static Method Starts
     @staticmethod
-    def save_node(
-        session: neo4j.Session,
+    async def save_node(
+        session: neo4j.AsyncManagedTransaction,
         nodename: str,
         nodetype: str,
         node_props: Optional[dict] = None,
         nodetype_props: Optional[dict] = None,
         parent_id: Optional[str] = None,
-        timestamp: float = time.time(),
+        timestamp: Optional[float] = None,
     ):
         """
         Creates or Merges the MQTT message as a Graph node. Each level of the topic is also
@@ -379,8 +722,8 @@ class GraphDBHandler:
 
         Parameters
         ----------
-        session  : neo4j.Session
-            Neo4j session object
+        session  : neo4j.AsyncManagedTransaction
+            Neo4j transaction object
         nodename : str
             Trimmed name of the topic
         nodetype : str
@@ -395,75 +738,35 @@ class GraphDBHandler:
             Used for nested attributes
         parent_id  : str
             elementId of the parent node to ensure unique relationships
+        timestamp : float, optional
+            Timestamp for receiving the message, by default the current time
 
         Returns the result of the query which will either be
             - one node (in case of top most node)
             - two node in the order of currently created/updated node, parent node
         """
-        LOGGER.debug(
-            "Saving node: %s of type: %s and attributes: %s with parent: %s",
-            str(nodename),
-            str(nodetype),
-            str(node_props),
-            str(nodetype_props),
-            str(parent_id),
-        )
+        if timestamp is None:
+            timestamp = time.time()
+        if LOGGER.isEnabledFor(logging.DEBUG):
+            LOGGER.debug(
+                "Saving node: %s of type: %s and attributes: %s with relation attributes: %s and parent: %s",
+                nodename,
+                nodetype,
+                node_props,
+                nodetype_props,
+                parent_id,
+            )
         # attributes should not be null for the query to work
         node_props = GraphDBHandler.transform_node_params_for_neo4j(node_props)
         # convert dict to a literal map for CQL as parameter maps are not allowed by Neo4j in queries
         literal_map = GraphDBHandler.get_literal_map(nodetype_props)
 
-        query = f"""//Find Parent node
-    OPTIONAL MATCH (parent) WHERE elementId(parent) = $parent_id
-    // Optional match the child node
-    OPTIONAL MATCH (parent) -[r:{NODE_RELATION_NAME} {literal_map} ]-> (child:{nodetype}{{ node_name: $nodename}})
-
-    // Use apoc.do.when to handle the case where parent is null
-    CALL apoc.do.when(
-        // Check if the child is null
-        parent is null,
-        "
-        MERGE (new_node:{nodetype} {{ node_name: $nodename }})
-        SET new_node.{CREATED_TIMESTAMP_KEY} = $timestamp
-        SET new_node += $attributes
-        RETURN new_node as child
-        ",
-        "
-        CALL apoc.do.when(
-            // Check if the child is nulls
-            child is null,
-            // Create a new node when the child is null
-            'CREATE (new_node:{nodetype} {{ node_name: $nodename }})
-            SET new_node.{CREATED_TIMESTAMP_KEY} = $timestamp
-            SET new_node += $attributes
-            MERGE (parent)-[r:{NODE_RELATION_NAME} {literal_map.replace('"', r'\"')} ]-> (new_node)
-            // Return the new child node, parent node
-            RETURN new_node as child, parent as parent
-            ',
-            // Modify the existing child node when it is not null
-            'SET child.{MODIFIED_TIMESTAMP_KEY} = $timestamp
-            SET child += $attributes
-            RETURN child as child, parent as parent
-            ',
-            // Pass in the variables
-            {{parent:parent, child:child, nodename:$nodename,
-             timestamp:$timestamp, attributes:$attributes}}
-            ) YIELD value as result
-
-        // Return the child node and the parent node
-        RETURN result.child as child, result.parent as parent
-        ",
-        // Pass in the variables
-        {{parent:parent, child:child, nodename:$nodename,
-          timestamp:$timestamp, attributes:$attributes}}
-        ) YIELD value
-    // return the child node
-    RETURN value.child
-    """
+        query = _build_save_node_query(nodetype, literal_map)
 
-        LOGGER.debug("CQL statement to be executed: %s", str(query))
+        if LOGGER.isEnabledFor(logging.DEBUG):
+            LOGGER.debug("CQL statement to be executed: %s", query)
 
-        result: neo4j.Result = session.run(
+        result: neo4j.AsyncResult = await session.run(
             query,
             nodename=nodename,
             timestamp=timestamp,
@@ -498,6 +801,22 @@ class GraphDBHandler:
                     attributes[key] = [str(x) for x in value]
         return attributes
 
+    # static Method Starts
+    @staticmethod
+    def sanitize_relation_props(attributes: Optional[dict]) -> dict:
+        """
+        Sanitizes the keys and values of the attributes to be added to a relationship
+        Same as `GraphDBHandler.get_literal_map` so that the relationships merged with parameters match the
+        ones merged with a literal map
+        """
+        if attributes is None:
+            return {}
+        return {
+            re.sub(SANITIZE_PATTERN, "", key): re.sub(SANITIZE_PATTERN, "", str(val)) for key, val in attributes.items()
+        }
+
+    # static Method Ends
+
     # static Method Starts
     @staticmethod
     def get_literal_map(attributes: dict) -> str:
@@ -550,7 +869,7 @@ class GraphDBHandler:
         complex_attr: dict = {}
         if attributes is None:
             # if this is not a dict then this must be a nested simple list
-            attributes = {}
+            return simple_attr, complex_attr
         for key, attr_val in attributes.items():
             # Handle restricted name node_name
             if key == NODE_NAME_KEY:
@@ -560,7 +879,7 @@ class GraphDBHandler:
                 # if the value is type dict then add it to the complex_attributes
                 complex_attr[key] = attr_val
 
-            elif isinstance(attr_val, list | tuple) and all(isinstance(item, dict) for item in attr_val):
+            elif isinstance(attr_val, _SEQUENCE_TYPES) and all(isinstance(item, dict) for item in attr_val):
                 # List/Tuple of complex attributes only. list of primitive values allowed under node
                 complex_attr[key] = attr_val
             else:
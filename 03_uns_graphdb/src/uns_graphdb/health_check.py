@@ -13,21 +13,34 @@ logger = logging.getLogger(__name__)
 
 def check_process(name: str) -> bool:
     """Check if the uns_graphdb process is running."""
-    for proc in psutil.process_iter(["pid", "name", "cmdline"]):
-        cmdline = proc.info.get("cmdline", [])
-        if any(name in " ".join(cmdline) for part in cmdline):
+    # only fetch the command line. it is None if the process is not accessible
+    for proc in psutil.process_iter(["cmdline"]):
+        cmdline = proc.info.get("cmdline") or []
+        if name in " ".join(cmdline):
             return True
     return False
 
 
-def check_existing_connection(host: str, port: int) -> bool:
-    """Check if a connection to the specified host and port is already established."""
+def get_tcp_connections() -> list:
+    """Get all active tcp connections. Empty if they could not be read"""
+    try:
+        return psutil.net_connections("tcp")
+    except Exception as ex:
+        logger.error(ex)
+        return []
+
+
+def check_existing_connection(host: str, port: int, connections: list | None = None) -> bool:
+    """
+    Check if a connection to the specified host and port is already established.
+    connections: the tcp connections to check, as returned by get_tcp_connections(). Read if not provided
+    """
     try:
         # Resolve the hostname to an IP address
         remote_ip = socket.gethostbyname(host)
 
-        # Get all active network connections
-        connections = psutil.net_connections("inet")
+        if connections is None:
+            connections = get_tcp_connections()
 
         # Check if any connection matches the resolved IP and port
         for conn in connections:
@@ -51,11 +64,14 @@ def main():
     if not check_process("uns_graphdb"):
         sys.exit(1)
 
+    # read the connections once for all the checks
+    connections = get_tcp_connections()
+
     # Get MQTT configuration
     mqtt_host = MQTTConfig.host
     mqtt_port = MQTTConfig.port
 
-    if not check_existing_connection(mqtt_host, mqtt_port):
+    if not check_existing_connection(mqtt_host, mqtt_port, connections):
         sys.exit(1)
 
     # Get GraphDB configuration
@@ -67,7 +83,7 @@ def main():
     host_port = graphdb_url.split(":")
     graphdb_host: str = host_port[0]
     graphdb_port: str | None = host_port[1] if len(host_port) > 1 else ""  # Get port if available
-    if not check_existing_connection(graphdb_host, int(graphdb_port)):
+    if not check_existing_connection(graphdb_host, int(graphdb_port), connections):
         sys.exit(1)
 
     logger.info("Health check passed.")
@@ -18,9 +18,12 @@
 MQTT listener that listens to ISA-95 UNS and SparkplugB and persists all messages to the GraphDB
 """
 
+import asyncio
 import logging
-import random
+import secrets
+import threading
 import time
+from concurrent.futures import Future
 
 from uns_mqtt.mqtt_listener import UnsMQTTClient
 
@@ -39,7 +42,7 @@ class UnsMqttGraphDb:
     def __init__(self):
         self.graph_db_handler = None
         self.uns_client: UnsMQTTClient = None
-        self.client_id = f"graphdb-{time.time()}-{random.randint(0, 1000)}"  # noqa: S311
+        self.client_id = f"graphdb-{secrets.token_hex(8)}"
         self.uns_client: UnsMQTTClient = UnsMQTTClient(
             client_id=self.client_id,
             clean_session=MQTTConfig.clean_session,
@@ -52,10 +55,22 @@ class UnsMqttGraphDb:
         self.uns_client.on_message = self.on_message
         self.uns_client.on_disconnect = self.on_disconnect
 
+        # persistence runs on a dedicated event loop so that the MQTT network thread is not blocked by the database
+        # and the writes of multiple messages overlap
+        self._loop = asyncio.new_event_loop()
+        self._loop_thread = threading.Thread(target=self._loop.run_forever, name=f"{self.client_id}-loop", daemon=True)
+        self._loop_thread.start()
+        # caps the number of messages being written concurrently
+        self._write_slots = threading.BoundedSemaphore(GraphDBConfig.max_concurrent_writes)
+        # last write per topic, so that the messages of a topic are written in the order they were received
+        # only accessed from the event loop
+        self._last_write: dict[str, asyncio.Future] = {}
+
         # Connect to the database
         self.graph_db_handler = GraphDBHandler(
             uri=GraphDBConfig.db_url, user=GraphDBConfig.user, password=GraphDBConfig.password, database=GraphDBConfig.database
         )
+        self.run_async(self.graph_db_handler.connect())
 
         self.uns_client.run(
             host=MQTTConfig.host,
@@ -74,8 +89,8 @@ class UnsMqttGraphDb:
         """
         Callback function executed every time a message is received by the subscriber
         """
-        LOGGER.debug("{" "Client: %s," "Userdata: %s," "Message: %s," "}", str(
-            client), str(userdata), str(msg))
+        if LOGGER.isEnabledFor(logging.DEBUG):
+            LOGGER.debug("{" "Client: %s," "Userdata: %s," "Message: %s," "}", client, userdata, msg)
         try:
             if msg.topic.startswith(UnsMQTTClient.SPARKPLUG_NS):
                 node_types = GraphDBConfig.spb_node_types
@@ -86,19 +101,26 @@ class UnsMqttGraphDb:
                 topic=msg.topic, payload=msg.payload, mqtt_ignored_attributes=MQTTConfig.ignored_attributes
             )
 
-            # save message
-            self.graph_db_handler.persist_mqtt_msg(
-                topic=msg.topic,
-                message=filtered_message,
-                timestamp=filtered_message.get(
-                    MQTTConfig.timestamp_key, time.time()),
-                node_types=node_types,
-                attr_node_type=GraphDBConfig.nested_attributes_node_type,
-            )
+            # hand over to the event loop without waiting for the write. blocks only if all the write slots are in use
+            self._write_slots.acquire()
+            try:
+                future = asyncio.run_coroutine_threadsafe(
+                    self._persist_in_order(
+                        topic=msg.topic,
+                        message=filtered_message,
+                        timestamp=filtered_message.get(MQTTConfig.timestamp_key, time.time()),
+                        node_types=node_types,
+                    ),
+                    self._loop,
+                )
+            except Exception:
+                self._write_slots.release()
+                raise
+            future.add_done_callback(lambda done: self._on_persisted(done, msg.topic, msg.payload))
         except SystemError as system_error:
             LOGGER.error(
                 "Fatal Error while parsing Message: %s\nTopic: %s \nMessage:%s\nExiting.........",
-                str(system_error),
+                system_error,
                 msg.topic,
                 msg.payload,
                 stack_info=True,
@@ -109,7 +131,7 @@ class UnsMqttGraphDb:
             # pylint: disable=broad-exception-caught
             LOGGER.error(
                 "Error persisting the message to the Graph DB: %s \nTopic: %s \nMessage:%s",
-                str(ex),
+                ex,
                 msg.topic,
                 msg.payload,
                 stack_info=True,
@@ -118,6 +140,81 @@ class UnsMqttGraphDb:
 
     # end of on_message----------------------------------------------------------------------------
 
+    async def _persist_in_order(self, topic: str, message: dict, timestamp: float, node_types: tuple):
+        """
+        Persists the message once the previous message on the same topic has been persisted
+        Messages on different topics are persisted concurrently
+        """
+        previous = self._last_write.get(topic)
+        current = asyncio.current_task()
+        self._last_write[topic] = current
+        try:
+            if previous is not None:
+                # the outcome of the previous write is handled by its own callback
+                await asyncio.wait([previous])
+            await self.graph_db_handler.persist_mqtt_msg(
+                topic=topic,
+                message=message,
+                timestamp=timestamp,
+                node_types=node_types,
+                attr_node_type=GraphDBConfig.nested_attributes_node_type,
+            )
+        finally:
+            if self._last_write.get(topic) is current:
+                del self._last_write[topic]
+
+    def _on_persisted(self, future: Future, topic: str, payload):
+        """
+        Callback executed once the write of a message has completed. Frees the write slot and logs any error
+        """
+        self._write_slots.release()
+        if future.cancelled():
+            return
+        ex = future.exception()
+        if isinstance(ex, SystemError):
+            LOGGER.error(
+                "Fatal Error while persisting Message: %s\nTopic: %s \nMessage:%s",
+                ex,
+                topic,
+                payload,
+                exc_info=ex,
+            )
+        elif ex is not None:
+            LOGGER.error(
+                "Error persisting the message to the Graph DB: %s \nTopic: %s \nMessage:%s",
+                ex,
+                topic,
+                payload,
+                exc_info=ex,
+            )
+
+    def run_async(self, coroutine):
+        """
+        Runs the coroutine on the event loop of the listener and waits for the result
+        """
+        return asyncio.run_coroutine_threadsafe(coroutine, self._loop).result()
+
+    def wait_for_pending(self):
+        """
+        Waits till all the messages being written have been persisted
+        """
+        for _ in range(GraphDBConfig.max_concurrent_writes):
+            self._write_slots.acquire()
+        for _ in range(GraphDBConfig.max_concurrent_writes):
+            self._write_slots.release()
+
+    def close(self):
+        """
+        Persists the pending messages, closes the connection to the graph database and stops the event loop
+        """
+        self.wait_for_pending()
+        try:
+            self.run_async(self.graph_db_handler.close())
+        finally:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._loop_thread.join()
+            self._loop.close()
+
     def on_disconnect(
         self,
         client,  # noqa: ARG002
@@ -130,8 +227,7 @@ class UnsMqttGraphDb:
         Callback function executed every time the client is disconnected from the MQTT broker
         """
         if reason_codes != 0:
-            LOGGER.error("Unexpected disconnection.:%s", str(
-                reason_codes), stack_info=True, exc_info=True)
+            LOGGER.error("Unexpected disconnection.:%s", reason_codes, stack_info=True)
 
     # end of on_disconnect-------------------------------------------------------------------------
 
@@ -148,9 +244,7 @@ def main():
     finally:
         if uns_mqtt_graphdb is not None:
             uns_mqtt_graphdb.uns_client.disconnect()
-
-        if (uns_mqtt_graphdb is not None) and (uns_mqtt_graphdb.graph_db_handler is not None):
-            uns_mqtt_graphdb.graph_db_handler.close()
+            uns_mqtt_graphdb.close()
 
 
 # end of main()------------------------------------------------------------------------------------
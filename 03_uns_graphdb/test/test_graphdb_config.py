@@ -152,6 +152,10 @@ def test_graph_db_configs():
         GraphDBConfig.nested_attributes_node_type,
     ), f"{GraphDBConfig.nested_attributes_node_type} at key: 'graphdb.nested_attribute_node_type' isn't a valid node name"
 
+    assert isinstance(GraphDBConfig.max_concurrent_writes, int) and GraphDBConfig.max_concurrent_writes > 0, (
+        f"Invalid value at key: 'graphdb.max_concurrent_writes':{GraphDBConfig.max_concurrent_writes}. Must be positive int"
+    )
+
 
 @pytest.mark.integrationtest()
 def test_connectivity_to_mqtt():
@@ -19,16 +19,43 @@ Tests for GraphDBHandler
 """
 
 import sys
-from typing import Optional
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
-from neo4j import Session, exceptions
+import pytest_asyncio
+from neo4j import Driver, GraphDatabase, Session, exceptions
 from uns_mqtt.mqtt_listener import UnsMQTTClient
 
 from uns_graphdb.graphdb_config import GraphDBConfig
 from uns_graphdb.graphdb_handler import NODE_NAME_KEY, NODE_RELATION_NAME, REL_ATTR_KEY, GraphDBHandler
 
 
+@pytest_asyncio.fixture(loop_scope="session", scope="session")
+async def graph_db_handler():
+    """
+    Shared GraphDBHandler for the tests marked integrationtest
+    The driver and session are created lazily on the first persist and reused across the tests instead of per test
+    """
+    handler = GraphDBHandler(
+        uri=GraphDBConfig.db_url,
+        user=GraphDBConfig.user,
+        password=GraphDBConfig.password,
+        database=GraphDBConfig.database,
+    )
+    yield handler
+    # Close the session and driver after all tests are completed
+    await handler.close()
+
+
+@pytest.fixture(scope="session")
+def graph_db_driver():
+    """
+    Shared synchronous driver to validate and cleanup the persisted data
+    """
+    with GraphDatabase.driver(GraphDBConfig.db_url, auth=(GraphDBConfig.user, GraphDBConfig.password)) as driver:
+        yield driver
+
+
 @pytest.mark.parametrize(
     "current_depth, expected_result",
     [
@@ -55,6 +82,24 @@ def test_get_node_name(current_depth: int, expected_result):
             Actual Result: {result}"""
 
 
+@pytest.mark.parametrize(
+    "topic, expected_result",
+    [
+        ("a/b/c", ("a", "b", "c")),
+        ("a", ("a",)),
+        ("/a/b/", ("a", "b")),  # leading and trailing slashes
+        ("a//b", ("a", "b")),  # consecutive slashes
+        ("/", ()),
+    ],
+)
+def test_get_topic_levels(topic: str, expected_result: tuple):
+    """
+    Testcase for GraphDBHandler.get_topic_levels.
+    Validate that empty levels are skipped
+    """
+    assert GraphDBHandler.get_topic_levels(topic) == expected_result
+
+
 @pytest.mark.parametrize(
     "message, plain, composite",
     [
@@ -140,9 +185,22 @@ def test_get_node_name(current_depth: int, expected_result):
                 },
             },
         ),  # test composite with name
+        (
+            {
+                "a": ({"name": "v1"}, {"name": "v2"}),
+                "b": [{"name": "v1"}, 10],
+            },
+            {
+                "b": [{"name": "v1"}, 10],
+            },
+            {
+                "a": ({"name": "v1"}, {"name": "v2"}),
+            },
+        ),  # test tuple of dict and mixed list
         ({}, {}, {}),  # test empty
         (None, {}, {}),  # test None
     ],
+    ids=["plain", "node_name", "composite_dict", "composite_with_name", "tuple_and_mixed_list", "empty", "none"],
 )
 def test_separate_plain_composite_attributes(message: dict, plain: dict, composite: dict):
     """
@@ -154,9 +212,171 @@ def test_separate_plain_composite_attributes(message: dict, plain: dict, composi
     assert result_composite == composite
 
 
-@pytest.mark.integrationtest()
 @pytest.mark.parametrize(
-    "topic, message",  # Test spB message persistence
+    "failed_attempts, max_retry, is_error",
+    [
+        (0, 2, False),  # connected in first attempt
+        (2, 2, False),  # connected in the last retry
+        (3, 2, True),  # retries exhausted
+        (10, 0, True),  # no retries
+    ],
+)
+@pytest.mark.asyncio(loop_scope="function")
+async def test_connect_retry(failed_attempts: int, max_retry: int, is_error: bool):
+    """
+    Testcase for GraphDBHandler.connect.
+    Validate that the connection is attempted at most max_retry + 1 times
+    """
+    graph_db_handler = GraphDBHandler(uri="bolt://localhost:7687", user="user", password="password", max_retry=max_retry)  # noqa: S106
+    with (
+        patch("neo4j.AsyncGraphDatabase.driver") as mock_driver,
+        patch("asyncio.sleep", new_callable=AsyncMock) as mock_sleep,
+    ):
+        mock_verify = AsyncMock(side_effect=[exceptions.ServiceUnavailable("Mocked Error")] * failed_attempts + [None])
+        mock_driver.return_value.verify_connectivity = mock_verify
+        if is_error:
+            with pytest.raises(SystemError):
+                await graph_db_handler.connect()
+        else:
+            assert await graph_db_handler.connect() is mock_driver.return_value
+
+        expected_attempts = min(failed_attempts, max_retry) + 1
+        assert mock_verify.call_count == expected_attempts
+        assert mock_sleep.call_count == min(failed_attempts, max_retry)
+
+
+@pytest.mark.asyncio(loop_scope="function")
+async def test_get_session():
+    """
+    Testcase for GraphDBHandler.get_session.
+    Validate that a released session is reused, that concurrent callers get their own session
+    and that the idle sessions are closed with the handler
+    """
+    graph_db_handler = GraphDBHandler(uri="bolt://localhost:7687", user="user", password="password")  # noqa: S106
+    with patch("neo4j.AsyncGraphDatabase.driver") as mock_driver:
+        mock_driver.return_value.verify_connectivity = AsyncMock()
+        mock_driver.return_value.close = AsyncMock()
+        mock_driver.return_value.session.side_effect = lambda database: MagicMock(close=AsyncMock())  # noqa: ARG005
+
+        session = await graph_db_handler.get_session()
+        other_session = await graph_db_handler.get_session()
+        assert other_session is not session
+        graph_db_handler.release_session(session)
+        assert await graph_db_handler.get_session() is session
+        assert mock_driver.return_value.session.call_count == 2
+        mock_driver.return_value.session.assert_called_with(database=graph_db_handler.database)
+
+        graph_db_handler.release_session(session)
+        graph_db_handler.release_session(other_session)
+        await graph_db_handler.close()
+        session.close.assert_awaited_once()
+        other_session.close.assert_awaited_once()
+        assert graph_db_handler.sessions == []
+        assert graph_db_handler.driver is None
+
+
+@pytest.mark.parametrize(
+    "error",
+    [
+        exceptions.TransientError("Mocked Error"),
+        exceptions.SessionExpired("Mocked Error"),
+        exceptions.DatabaseUnavailable("Mocked Error"),
+        exceptions.ServiceUnavailable("Mocked Error"),
+    ],
+)
+@pytest.mark.asyncio(loop_scope="function")
+async def test_persist_mqtt_msg_retry(error: Exception):
+    """
+    Testcase for GraphDBHandler.persist_mqtt_msg.
+    Validate that the failed session is discarded and a new one is taken from the pool
+    when the write fails with an error which can be retried
+    """
+    graph_db_handler = GraphDBHandler(uri="bolt://localhost:7687", user="user", password="password", max_retry=1)  # noqa: S106
+    with (
+        patch("neo4j.AsyncGraphDatabase.driver") as mock_driver,
+        patch("asyncio.sleep", new_callable=AsyncMock),
+        patch.object(graph_db_handler, "create_node_indexes", new_callable=AsyncMock),
+    ):
+        mock_driver.return_value.verify_connectivity = AsyncMock()
+        mock_driver.return_value.close = AsyncMock()
+        mock_session = mock_driver.return_value.session.return_value
+        mock_session.close = AsyncMock()
+        mock_session.execute_write = AsyncMock(side_effect=[error, None])
+
+        await graph_db_handler.persist_mqtt_msg(topic="a/b/c", message={"key": "value"})
+
+        assert mock_session.execute_write.await_count == 2
+        mock_session.close.assert_awaited_once()
+        assert mock_driver.return_value.session.call_count == 2
+
+
+@pytest.mark.asyncio(loop_scope="function")
+async def test_save_nested_attribute_nodes():
+    """
+    Testcase for GraphDBHandler.save_nested_attribute_nodes.
+    Validate that the attribute nodes are merged with one query per level of nesting and relationship keys
+    """
+
+    class MockResult:
+        """
+        Async iterable over the records returned by the batch query
+        """
+
+        def __init__(self, rows: list[dict]):
+            self.rows = rows
+
+        async def __aiter__(self):
+            for row in self.rows:
+                yield {"row_id": row["row_id"], "child_id": row["node_name"] + "_id"}
+
+    mock_session = AsyncMock()
+    mock_session.run.side_effect = lambda query, rows, timestamp: MockResult(rows)  # noqa: ARG005
+    message: dict = {
+        "dict_1": {"a": 1, "nested": {"b": 2}},
+        "dict_2": {"c": 3},
+        "list": [{"name": "item", "d": 4}, {"e": 5}],
+        "empty": {},
+    }
+    _, compound_props = GraphDBHandler.separate_plain_composite_attributes(message)
+    await GraphDBHandler.save_nested_attribute_nodes(
+        session=mock_session,
+        attr_nodes=GraphDBHandler.get_child_attribute_nodes(compound_props, "leaf_id", "NESTED_ATTRIBUTE"),
+        attr_node_type="NESTED_ATTRIBUTE",
+        timestamp=1.0,
+    )
+    # level 1: one query for the dicts and one for the list items. level 2: one query for the nested dict
+    assert mock_session.run.call_count == 3
+    saved_rows = [row for call in mock_session.run.call_args_list for row in call.kwargs["rows"]]
+    assert [(row["node_name"], row["parent_id"]) for row in saved_rows] == [
+        ("dict_1", "leaf_id"),
+        ("dict_2", "leaf_id"),
+        ("item", "leaf_id"),
+        ("list_1", "leaf_id"),
+        ("nested", "dict_1_id"),
+    ]
+    assert saved_rows[2]["rel"] == {REL_ATTR_KEY: "list", "type": "list", "index": "0"}
+
+
+@pytest.mark.asyncio(loop_scope="function")
+async def test_create_node_indexes():
+    """
+    Testcase for GraphDBHandler.create_node_indexes.
+    Validate that the index is created only once per node type
+    """
+    graph_db_handler = GraphDBHandler(uri="bolt://localhost:7687", user="user", password="password")  # noqa: S106
+    mock_session = AsyncMock()
+
+    await graph_db_handler.create_node_indexes(mock_session, {"ENTERPRISE", "FACILITY"})
+    assert mock_session.run.call_count == 2
+    assert graph_db_handler.indexed_node_types == {"ENTERPRISE", "FACILITY"}
+
+    await graph_db_handler.create_node_indexes(mock_session, {"ENTERPRISE", "NESTED_ATTRIBUTE"})
+    assert mock_session.run.call_count == 3
+    assert mock_session.run.call_args.args[0] == "CREATE INDEX IF NOT EXISTS FOR (n:NESTED_ATTRIBUTE) ON (n.node_name)"
+
+
+@pytest.mark.parametrize(
+    "topic, message, attr_node_names",
     [
         (
             "test/uns/ar1/ln2",
@@ -164,6 +384,7 @@ def test_separate_plain_composite_attributes(message: dict, plain: dict, composi
                 "timestamp": 1486144502122,
                 "TestMetric2": "TestUNS",
             },
+            [],
         ),
         (
             "test/uns/ar2/ln3",
@@ -172,6 +393,7 @@ def test_separate_plain_composite_attributes(message: dict, plain: dict, composi
                 "TestMetric2": "TestUNSwithLists",
                 "list": [1, 2, 3, 4, 5],
             },
+            [],
         ),
         (
             "test/uns/ar2/ln4",
@@ -185,6 +407,7 @@ def test_separate_plain_composite_attributes(message: dict, plain: dict, composi
                     "x": "y",
                 },
             },
+            ["my_dict", "my_other_dict"],
         ),
         (
             "test/uns/ar2/ln5",
@@ -200,72 +423,138 @@ def test_separate_plain_composite_attributes(message: dict, plain: dict, composi
                     },
                 ],
             },
+            ["dict_list_0", "dict_list_1"],
         ),
     ],
+    ids=["flat", "primitive_list", "nested_dict", "list_of_dicts"],
 )
-def test_persist_mqtt_msg(topic: str, message: dict):
+@pytest.mark.asyncio(loop_scope="function")
+async def test_save_all_nodes(topic: str, message: dict, attr_node_names: list[str]):
+    """
+    Testcase for GraphDBHandler.save_all_nodes without a database.
+    Validate that the topic path carries the primitive attributes and the nested dict object is split into child nodes
+    """
+
+    class MockTransaction:
+        """
+        Records the queries run and returns the ids for the merged nodes
+        """
+
+        def __init__(self):
+            self.runs: list[dict] = []
+
+        async def run(self, query: str, **params):  # noqa: ARG002
+            self.runs.append(params)
+            result = AsyncMock()
+            if "path" in params:
+                result.single.return_value = ["leaf_id"]
+            else:
+                result.__aiter__.return_value = [
+                    {"row_id": row["row_id"], "child_id": row["node_name"] + "_id"} for row in params["rows"]
+                ]
+            return result
+
+    graph_db_handler = GraphDBHandler(uri="bolt://localhost:7687", user="user", password="password")  # noqa: S106
+    mock_tx = MockTransaction()
+    await graph_db_handler.save_all_nodes(
+        session=mock_tx,
+        topic=topic,
+        message=message,
+        timestamp=1.0,
+        node_types=GraphDBConfig.uns_node_types,
+        attr_node_type="NESTED_ATTRIBUTE",
+    )
+    primitive_props, _ = GraphDBHandler.separate_plain_composite_attributes(message)
+    # the topic path and the primitive attributes of the leaf are saved with the first query
+    assert mock_tx.runs[0]["path"] == topic.split("/")
+    assert mock_tx.runs[0]["attributes"] == GraphDBHandler.transform_node_params_for_neo4j(primitive_props)
+    saved_rows = [row for params in mock_tx.runs[1:] for row in params["rows"]]
+    assert sorted(row["node_name"] for row in saved_rows) == attr_node_names
+    assert all(row["parent_id"] == "leaf_id" for row in saved_rows)
+
+
+@pytest.mark.integrationtest()
+@pytest.mark.parametrize(
+    "topic, message",  # one representative message per shape. exhaustive shapes are covered by test_save_all_nodes
+    [
+        (
+            "test/uns/ar2/ln3",
+            {
+                "timestamp": 1486144502144,
+                "TestMetric2": "TestUNSwithLists",
+                "list": [1, 2, 3, 4, 5],
+            },
+        ),
+        (
+            "test/uns/ar2/ln4",
+            {
+                "timestamp": 1486144500000,
+                "TestMetric2": "TestUNSwithNestedDictAndLists",
+                "my_dict": {
+                    "a": "b",
+                },
+                "dict_list": [
+                    {
+                        "a": "b",
+                    },
+                    {
+                        "x": "y",
+                    },
+                ],
+            },
+        ),
+    ],
+    ids=["primitive_list", "nested_dict_and_list"],
+)
+@pytest.mark.asyncio(loop_scope="session")
+async def test_persist_mqtt_msg(graph_db_handler: GraphDBHandler, graph_db_driver: Driver, topic: str, message: dict):
     """
     Testcase for GraphDBHandler.persist_mqtt_msg.
     Validate that the nested dict object is properly split
     """
-    graphdb_url: str = GraphDBConfig.db_url
-    graphdb_user: str = GraphDBConfig.user
-
-    graphdb_password: str = GraphDBConfig.password
-    graphdb_database: Optional[str] = GraphDBConfig.database
     if topic.startswith(UnsMQTTClient.SPARKPLUG_NS):
         node_types: tuple = GraphDBConfig.spb_node_types
     else:
         node_types: tuple = GraphDBConfig.uns_node_types
 
     attr_nd_typ: str = GraphDBConfig.nested_attributes_node_type
+    # validate with a separate synchronous driver as the read helpers are shared with test_uns_graphdb
     try:
-        graph_db_handler = GraphDBHandler(
-            uri=graphdb_url, user=graphdb_user, password=graphdb_password, database=graphdb_database
-        )
         # persist data
-        graph_db_handler.persist_mqtt_msg(topic=topic, message=message, node_types=node_types, attr_node_type=attr_nd_typ)
+        await graph_db_handler.persist_mqtt_msg(
+            topic=topic, message=message, node_types=node_types, attr_node_type=attr_nd_typ
+        )
         # validate data which was persisted
-        with graph_db_handler.connect().session(database=graph_db_handler.database) as session:
+        with graph_db_driver.session(database=graph_db_handler.database) as session:
             session.execute_read(read_topic_nodes, node_types, attr_nd_typ, topic, message)
 
     except (exceptions.TransientError, exceptions.TransactionError) as ex:
         pytest.fail("Connection to either the MQTT Broker or " f"the Graph DB did not happen: Exception {ex}")
     finally:
         # After successfully validating the data run a new transaction to delete
-        with graph_db_handler.connect().session(database=graph_db_handler.database) as session:
+        with graph_db_driver.session(database=graph_db_handler.database) as session:
             session.execute_write(cleanup_test_data, topic.split("/")[0], node_types[0])
 
-        if graph_db_handler is not None:
-            graph_db_handler.close()
-
 
 def read_topic_nodes(session: Session, topic_node_types: tuple, attr_node_type: str, topic: str, message: dict):
     """
     Helper function to read the database and compare the persisted data
     """
     topic_list: list = topic.split("/")
-    records: list = []
-    index = 0
-    last_node_id = None
-    for node, node_label in zip(topic_list, topic_node_types):
-        if index == 0:
-            query = f"MATCH (node:{node_label}{{ node_name: $node_name }})\n"
-            query = query + " RETURN node"
-        else:
-            query = f"MATCH(parent) -[rel:{NODE_RELATION_NAME}]->"
-            query = query + f" (node:{node_label}{{ node_name: $node_name }})"
-            query = query + "WHERE elementId(parent) = $parent_id "
-            query = query + " RETURN node, rel"
-
-        result = session.run(query, node_name=node, parent_id=last_node_id)
-        records = list(result)
-        assert result is not None and len(records) == 1
-        if index > 0:
-            assert records[0].values()[1].type == NODE_RELATION_NAME
-
-        db_node = records[0].values()[0]
-        last_node_id = records[0][0].element_id
+    path_nodes: list = list(zip(topic_list, topic_node_types))
+    # read the whole topic path in a single query instead of one query per topic level
+    query = "MATCH path = " + f"-[:{NODE_RELATION_NAME}]->".join(
+        f"(:{node_label}{{ node_name: $node_names[{index}] }})" for index, (_, node_label) in enumerate(path_nodes)
+    )
+    query = query + " RETURN nodes(path), relationships(path)"
+
+    result = session.run(query, node_names=[node for node, _ in path_nodes])
+    records = list(result)
+    assert result is not None and len(records) == 1
+    db_nodes, db_relations = records[0].values()
+    assert all(rel.type == NODE_RELATION_NAME for rel in db_relations)
+
+    for index, ((node, node_label), db_node) in enumerate(zip(path_nodes, db_nodes)):
         # check node_name
         assert db_node.get("node_name") == node
         # labels is a frozen set
@@ -277,17 +566,27 @@ def read_topic_nodes(session: Session, topic_node_types: tuple, attr_node_type:
             primitive_props, compound_props = GraphDBHandler.separate_plain_composite_attributes(message)
 
             read_primitive_attr_nodes(db_node, primitive_props)
+            read_attr_nodes(session, attr_node_type, parent_id, compound_props)
 
-            for attr_key, value in compound_props.items():
-                if isinstance(value, dict):
-                    read_dict_attr_node(session, attr_node_type, parent_id, attr_key, value)
 
-                elif isinstance(value, (list, tuple)):
-                    read_list_attr_nodes(session, attr_node_type, parent_id, attr_key, value)
+def read_attr_nodes(session: Session, attr_node_type: str, parent_id: str, compound_props: dict):
+    """
+    Reads all the nested attribute nodes under the parent node to check values
+    Traverses the nesting iteratively with an explicit stack of (parent_id, attr_key, value) instead of recursion
+    """
+    stack: list[tuple[str, str, dict | list | tuple]] = [
+        (parent_id, attr_key, value) for attr_key, value in compound_props.items()
+    ]
+    while stack:
+        node_parent_id, attr_key, value = stack.pop()
+        if isinstance(value, dict):
+            stack.extend(read_dict_attr_node(session, attr_node_type, node_parent_id, attr_key, value))
 
-                else:
-                    pytest.fail("compound properties should only be list of dict or dict ")
-        index = index + 1
+        elif isinstance(value, (list, tuple)):
+            stack.extend(read_list_attr_nodes(session, attr_node_type, node_parent_id, attr_key, value))
+
+        else:
+            pytest.fail("compound properties should only be list of dict or dict ")
 
 
 def read_primitive_attr_nodes(db_node, primitive_props: dict):
@@ -309,9 +608,12 @@ def read_primitive_attr_nodes(db_node, primitive_props: dict):
             assert db_node.get(attr_key) == value
 
 
-def read_list_attr_nodes(session: Session, attr_node_type: str, parent_id: str, attr_key: str, node_array: list[dict]):
+def read_list_attr_nodes(
+    session: Session, attr_node_type: str, parent_id: str, attr_key: str, node_array: list[dict]
+) -> list[tuple]:
     """
     Reads a list of attribute nodes to check values
+    Returns the (parent_id, attr_key, value) of the compound properties of the nodes which are still to be read
     """
     list_query: str = f"""
     MATCH (parent) -[rel:{NODE_RELATION_NAME}]-> (child: {attr_node_type})
@@ -328,6 +630,7 @@ def read_list_attr_nodes(session: Session, attr_node_type: str, parent_id: str,
     # iterate through node_array, split into primitive and compound
     # iterate through db_list_records[i].values()[0] for matching node_name. then match primitive values
     matched_nodes = 0
+    pending: list[tuple] = []
     for record in db_list_records:
         db_node = record.values()[0]
         relation = record.values()[1]
@@ -343,24 +646,17 @@ def read_list_attr_nodes(session: Session, attr_node_type: str, parent_id: str,
             if db_node.get(NODE_NAME_KEY) == node_name:
                 matched_nodes = matched_nodes + 1
                 read_primitive_attr_nodes(db_node, primitive_props)
-
-                for child_key, child_value in compound_props.items():
-                    if isinstance(child_value, dict):
-                        read_dict_attr_node(session, attr_node_type, db_node_id, child_key, child_value)
-
-                    elif isinstance(child_value, (list, tuple)):
-                        read_list_attr_nodes(session, attr_node_type, db_node_id, child_key, child_value)
-
-                    else:
-                        pytest.fail("compound properties should only be list of dict or dict ")
+                pending.extend((db_node_id, child_key, child_value) for child_key, child_value in compound_props.items())
                 break  # since the node was matched, we can break out of the inner loop
             index = index + 1
     assert matched_nodes == len(node_array)
+    return pending
 
 
-def read_dict_attr_node(session, attr_node_type: str, parent_id: str, attr_key: str, node: dict):
+def read_dict_attr_node(session, attr_node_type: str, parent_id: str, attr_key: str, node: dict) -> list[tuple]:
     """;
     Read and compare node created for nested dict attributes in the message
+    Returns the (parent_id, attr_key, value) of the compound properties of the node which are still to be read
     """
     # Need to enhance test to handle nested dicts
     db_node_query: str = f"""
@@ -380,15 +676,7 @@ def read_dict_attr_node(session, attr_node_type: str, parent_id: str, attr_key:
 
     primitive_props, compound_props = GraphDBHandler.separate_plain_composite_attributes(node)
     read_primitive_attr_nodes(db_nodes[0][0], primitive_props)
-    for child_key, child_value in compound_props.items():
-        if isinstance(child_value, dict):
-            read_dict_attr_node(session, attr_node_type, node_id, child_key, child_value)
-
-        elif isinstance(child_value, (list, tuple)):
-            read_list_attr_nodes(session, attr_node_type, node_id, child_key, child_value)
-
-        else:
-            pytest.fail("compound properties should only be list of dict or dict ")
+    return [(node_id, child_key, child_value) for child_key, child_value in compound_props.items()]
 
 
 def cleanup_test_data(session: Session, node: str, node_type: str):
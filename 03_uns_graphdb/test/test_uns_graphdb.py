@@ -18,27 +18,81 @@
 Tests for Uns_MQTT_GraphDb
 """
 
+import asyncio
 import json
 import sys
+import threading
 from pathlib import Path
+from unittest.mock import MagicMock, patch
 
 import pytest
-from neo4j import exceptions
+from neo4j import GraphDatabase, exceptions
 from paho.mqtt.packettypes import PacketTypes
 from paho.mqtt.properties import Properties
-from uns_mqtt.mqtt_listener import MQTTVersion
+from uns_mqtt.mqtt_listener import MQTTVersion, UnsMQTTClient
 from uns_sparkplugb.uns_spb_helper import convert_spb_bytes_payload_to_dict
 
 from uns_graphdb.graphdb_config import GraphDBConfig
 from uns_graphdb.uns_mqtt_graphdb import UnsMqttGraphDb
 
-test_folder = (Path(__file__).resolve().parent.parent / "test").resolve()
-sys.path.insert(0, str(test_folder))
 # @FIXME Hack done to be able to import utility modules in the tests directories
 # @See https://docs.pytest.org/en/7.1.x/explanation/pythonpath.html importlib
+test_folder = str(Path(__file__).resolve().parent)
+if test_folder not in sys.path:
+    sys.path.insert(0, test_folder)
 import test_graphdb_handler  # noqa: E402
 
 
+@pytest.fixture
+def mock_uns_client():
+    with patch("uns_graphdb.uns_mqtt_graphdb.UnsMQTTClient", autospec=True) as mock_client:
+        mock_client.SPARKPLUG_NS = UnsMQTTClient.SPARKPLUG_NS
+        mock_client.return_value.get_payload_as_dict.side_effect = lambda topic, payload, mqtt_ignored_attributes: json.loads(  # noqa: ARG005
+            payload
+        )
+        yield mock_client
+
+
+@pytest.fixture
+def mock_graph_db_handler():
+    with patch("uns_graphdb.uns_mqtt_graphdb.GraphDBHandler", autospec=True) as mock_handler:
+        yield mock_handler
+
+
+def test_on_message_writes_concurrently_in_topic_order(mock_uns_client, mock_graph_db_handler):  # noqa: ARG001
+    """
+    Validate that on_message does not wait for the write, that messages on different topics are written concurrently
+    and that messages on the same topic are written in the order received
+    """
+    release_writes = threading.Event()
+    events: list[tuple[str, str, int]] = []
+
+    async def mock_persist(topic: str, message: dict, **kwargs):  # noqa: ARG001
+        events.append(("start", topic, message["seq"]))
+        await asyncio.get_running_loop().run_in_executor(None, release_writes.wait)
+        events.append(("end", topic, message["seq"]))
+
+    uns_mqtt_graphdb = UnsMqttGraphDb()
+    uns_mqtt_graphdb.graph_db_handler.persist_mqtt_msg.side_effect = mock_persist
+    try:
+        for seq, topic in enumerate(["a/b/c", "a/b/d", "a/b/c"]):
+            uns_mqtt_graphdb.on_message(None, None, MagicMock(topic=topic, payload=json.dumps({"seq": seq})))
+        # both topics are being written while the second message of a/b/c waits for the first one
+        assert not release_writes.is_set()
+        while len(events) < 2:
+            threading.Event().wait(0.01)
+        assert sorted(events) == [("start", "a/b/c", 0), ("start", "a/b/d", 1)]
+
+        release_writes.set()
+        uns_mqtt_graphdb.wait_for_pending()
+        topic_events = [event for event in events if event[1] == "a/b/c"]
+        assert topic_events == [("start", "a/b/c", 0), ("end", "a/b/c", 0), ("start", "a/b/c", 2), ("end", "a/b/c", 2)]
+    finally:
+        release_writes.set()
+        uns_mqtt_graphdb.close()
+    uns_mqtt_graphdb.graph_db_handler.close.assert_awaited_once()
+
+
 @pytest.mark.integrationtest()
 def test_uns_mqtt_graph_db():
     """
@@ -56,9 +110,7 @@ def test_uns_mqtt_graph_db():
     finally:
         if uns_mqtt_graphdb is not None:
             uns_mqtt_graphdb.uns_client.disconnect()
-
-        if (uns_mqtt_graphdb is not None) and (uns_mqtt_graphdb.graph_db_handler is not None):
-            uns_mqtt_graphdb.graph_db_handler.close()
+            uns_mqtt_graphdb.close()
 
 
 # spell-checker:disable
@@ -137,6 +189,8 @@ def test_mqtt_graphdb_persistence(topic: str, message: dict):
 
         def on_message_decorator(client, userdata, msg):
             old_on_message(client, userdata, msg)
+            # the message is persisted asynchronously
+            uns_mqtt_graphdb.wait_for_pending()
             if topic.startswith("spBv1.0/"):
                 message_dict: dict = convert_spb_bytes_payload_to_dict(message)
                 node_type = GraphDBConfig.spb_node_types
@@ -146,20 +200,21 @@ def test_mqtt_graphdb_persistence(topic: str, message: dict):
 
             attr_nd_typ: str = GraphDBConfig.nested_attributes_node_type
 
-            try:
-                with uns_mqtt_graphdb.graph_db_handler.connect().session(
-                    database=uns_mqtt_graphdb.graph_db_handler.database,
-                ) as session:
-                    session.execute_read(test_graphdb_handler.read_topic_nodes, node_type, attr_nd_typ, topic, message_dict)
-            except (exceptions.TransientError, exceptions.TransactionError) as ex:
-                pytest.fail("Connection to either the MQTT Broker or " f"the Graph DB did not happen: Exception {ex}")
-            finally:
-                # After successfully validating the data run a new transaction to delete
-                with uns_mqtt_graphdb.graph_db_handler.connect().session(
-                    database=uns_mqtt_graphdb.graph_db_handler.database,
-                ) as session:
-                    session.execute_write(test_graphdb_handler.cleanup_test_data, topic.split("/")[0], node_type[0])
-                uns_mqtt_graphdb.uns_client.disconnect()
+            # validate with a separate synchronous driver as this callback is not a coroutine
+            graph_db_handler = uns_mqtt_graphdb.graph_db_handler
+            with GraphDatabase.driver(graph_db_handler.uri, auth=graph_db_handler.auth) as driver:
+                try:
+                    with driver.session(database=graph_db_handler.database) as session:
+                        session.execute_read(
+                            test_graphdb_handler.read_topic_nodes, node_type, attr_nd_typ, topic, message_dict
+                        )
+                except (exceptions.TransientError, exceptions.TransactionError) as ex:
+                    pytest.fail("Connection to either the MQTT Broker or " f"the Graph DB did not happen: Exception {ex}")
+                finally:
+                    # After successfully validating the data run a new transaction to delete
+                    with driver.session(database=graph_db_handler.database) as session:
+                        session.execute_write(test_graphdb_handler.cleanup_test_data, topic.split("/")[0], node_type[0])
+                    uns_mqtt_graphdb.uns_client.disconnect()
 
         # --- end of function
 
@@ -192,6 +247,4 @@ def test_mqtt_graphdb_persistence(topic: str, message: dict):
     finally:
         if uns_mqtt_graphdb is not None:
             uns_mqtt_graphdb.uns_client.disconnect()
-
-        if (uns_mqtt_graphdb is not None) and (uns_mqtt_graphdb.graph_db_handler is not None):
-            uns_mqtt_graphdb.graph_db_handler.close()
+            uns_mqtt_graphdb.close()
@@ -51,7 +51,7 @@ class MQTTConfig:
     version: Literal[MQTTVersion.MQTTv5, MQTTVersion.MQTTv311, MQTTVersion.MQTTv31] = settings.get(
         "mqtt.version", MQTTVersion.MQTTv5
     )
-    qos: Literal[0, 1, 2] = settings.get("mqtt.qos", 2)
+    qos: Literal[0, 1, 2] = settings.get("mqtt.qos", 1)
     reconnect_on_failure: bool = settings.get("mqtt.reconnect_on_failure", True)
     clean_session: Optional[bool] = settings.get("mqtt.clean_session", None)
 
@@ -70,6 +70,11 @@ class MQTTConfig:
         LOGGER.error(
             "MQTT Host not provided. Update key 'mqtt.host' in '../../conf/settings.yaml'",
         )
+    if qos == 2:
+        LOGGER.warning(
+            "MQTT QoS 2 needs a four step handshake per message which limits the subscription throughput. "
+            "Consider 'mqtt.qos' 1 unless exactly once delivery is required",
+        )
 
     @classmethod
     def is_config_valid(cls) -> bool:
@@ -99,6 +104,18 @@ class HistorianConfig:
 
     table: str = settings.get("historian.table")
 
+    # messages are buffered and inserted in batches of upto batch_size or every flush_interval seconds
+    batch_size: int = settings.get("historian.batch_size", 500)
+    flush_interval: float = settings.get("historian.flush_interval", 1.0)
+    # maximum number of messages queued for persistence. the MQTT client waits when the queue is full
+    queue_size: int = settings.get("historian.queue_size", 10000)
+    # skip persisting a message if its payload is identical to the previous message on the same topic
+    skip_duplicates: bool = settings.get("historian.skip_duplicates", False)
+
+    # size of the connection pool shared across all instances of HistorianHandler
+    pool_min_size: int = settings.get("historian.pool_min_size", 2)
+    pool_max_size: int = settings.get("historian.pool_max_size", 16)
+
     if hostname is None:
         LOGGER.error(
             "Historian Url not provided. " "Update key 'historian.hostname' in '../../conf/settings.yaml'",
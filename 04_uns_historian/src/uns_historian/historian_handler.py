@@ -20,10 +20,11 @@ Encapsulate logic of persisting messages to the historian database
 
 import json
 import logging
-from datetime import UTC, datetime
+import time
 from typing import Optional
 
 import asyncpg
+import orjson
 from asyncpg import Pool, Record
 from asyncpg.connection import Connection
 from asyncpg.prepared_stmt import PreparedStatement
@@ -76,6 +77,8 @@ class HistorianHandler:
                 database=HistorianConfig.database,
                 port=HistorianConfig.port,
                 ssl=HistorianConfig.get_ssl_context(),
+                min_size=HistorianConfig.pool_min_size,
+                max_size=HistorianConfig.pool_max_size,
             )
             LOGGER.info("Connection pool created successfully")
             return pool
@@ -133,7 +136,7 @@ class HistorianHandler:
         """
         try:
             if self._conn is None or self._conn.is_closed():
-                self._conn = await self._pool().acquire()
+                self._conn = await self._pool.acquire()
             stmt: PreparedStatement = await self._conn.prepare(query)
             results: Record = await stmt.fetch(*args)
             return results
@@ -146,6 +149,57 @@ class HistorianHandler:
             if self._conn and not self._conn.is_closed():
                 await self._pool.release(self._conn)
 
+    async def execute_many(self, query: str, args: list[tuple]):
+        """
+        Executes a query for each set of parameters in a single round trip to the database.
+        No records are returned
+
+        Args:
+            query (str): The SQL query to execute.
+            args (list[tuple]): list of query parameters, one tuple per execution.
+
+        Raises:
+            asyncpg.PostgresError: If there's an error executing the statement.
+        """
+        try:
+            if self._conn is None or self._conn.is_closed():
+                self._conn = await self._pool.acquire()
+            await self._conn.executemany(query, args)
+
+        except asyncpg.PostgresError as ex:
+            LOGGER.error(f"Error executing batch statement: {ex}")
+            raise
+        finally:
+            # Ensure that the connection is released back to the pool
+            if self._conn and not self._conn.is_closed():
+                await self._pool.release(self._conn)
+
+    # static method starts
+    @staticmethod
+    def get_timestamp_in_ms(timestamp: Optional[float]) -> float:
+        """
+        Returns the message timestamp in milliseconds which is converted to TIMESTAMPTZ by the database
+        Current time is used if the timestamp is None
+        """
+        if timestamp is None:
+            return time.time() * 1000
+        return float(timestamp)
+
+    @staticmethod
+    def serialize_message(message) -> str:
+        """
+        Serializes the message to the JSON string stored in the mqtt_msg column
+        Uses orjson which is significantly faster than json.dumps for the nested payloads
+        orjson rejects some values json.dumps accepts e.g. integers beyond 64 bits, for which json.dumps is used instead
+        NaN and Infinity are written as null by orjson as they are not valid in a jsonb column
+        """
+        try:
+            return orjson.dumps(message, option=orjson.OPT_NON_STR_KEYS).decode()
+        except orjson.JSONEncodeError:
+            return json.dumps(message)
+
+    # static method Ends
+
     async def persist_mqtt_msg(self, client_id: str, topic: str, timestamp: Optional[float], message: dict):
         """
         Persists all mqtt message in the historian
@@ -159,15 +213,41 @@ class HistorianHandler:
         message: str
             The MQTT message. String is expected to be JSON formatted
         """
-        if timestamp is None:
-            db_timestamp = datetime.now(UTC)
-        else:
-            # Timestamp is normally in milliseconds and needs to be converted prior to insertion
-            db_timestamp = datetime.fromtimestamp(timestamp / 1000, UTC)
         # sometimes when qos is not 2, the mqtt message may be delivered multiple times. in such case avoid duplicate inserts
         sql_cmd = f"""INSERT INTO {HistorianConfig.table} ( time, topic, client_id, mqtt_msg )
-                        VALUES ($1,$2,$3,$4)
+                        VALUES (to_timestamp($1::double precision / 1000),$2,$3,$4)
                         ON CONFLICT DO NOTHING
                         RETURNING *;"""  # noqa: S608:
-        params = [db_timestamp, topic, client_id, json.dumps(message)]
+        # Timestamp is normally in milliseconds and is converted by the database prior to insertion
+        params = [
+            HistorianHandler.get_timestamp_in_ms(timestamp),
+            topic,
+            client_id,
+            HistorianHandler.serialize_message(message),
+        ]
         return await self.execute_prepared(sql_cmd, *params)
+
+    async def persist_mqtt_msgs(self, messages: list[tuple[str, str, Optional[float], dict]]):
+        """
+        Persists a batch of mqtt messages in the historian in one round trip instead of one insert per message
+        ----------
+        messages: list[tuple[str, str, Optional[float], dict]]
+            list of (client_id, topic, timestamp, message) with the same semantics as the parameters of
+            `HistorianHandler.persist_mqtt_msg`
+        """
+        if not messages:
+            return
+        # no RETURNING as the inserted records are not needed and would have to be fetched for the whole batch
+        sql_cmd = f"""INSERT INTO {HistorianConfig.table} ( time, topic, client_id, mqtt_msg )
+                        VALUES (to_timestamp($1::double precision / 1000),$2,$3,$4)
+                        ON CONFLICT DO NOTHING;"""  # noqa: S608:
+        params = [
+            (
+                HistorianHandler.get_timestamp_in_ms(timestamp),
+                topic,
+                client_id,
+                HistorianHandler.serialize_message(message),
+            )
+            for client_id, topic, timestamp, message in messages
+        ]
+        await self.execute_many(sql_cmd, params)
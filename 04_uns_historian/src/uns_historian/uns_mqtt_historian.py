@@ -20,16 +20,21 @@ MQTT listener that listens to ISA-95 UNS and SparkplugB and persists all message
 
 import asyncio
 import logging
-import random
+import secrets
+import threading
 import time
+from collections import OrderedDict
 
 from uns_mqtt.mqtt_listener import UnsMQTTClient
 
-from uns_historian.historian_config import MQTTConfig
+from uns_historian.historian_config import HistorianConfig, MQTTConfig
 from uns_historian.historian_handler import HistorianHandler
 
 LOGGER = logging.getLogger(__name__)
 
+# maximum number of topics for which the hash of the last payload is kept. the least recently received topics are dropped
+MAX_TOPICS_FOR_DUPLICATE_CHECK: int = 10000
+
 
 class UnsMqttHistorian:
     """
@@ -38,7 +43,7 @@ class UnsMqttHistorian:
     """
 
     def __init__(self):
-        self.client_id = f"historian-{time.time()}-{random.randint(0, 1000)}"  # noqa: S311
+        self.client_id = f"historian-{secrets.token_hex(8)}"
         self.uns_client: UnsMQTTClient = UnsMQTTClient(
             client_id=self.client_id,
             clean_session=MQTTConfig.clean_session,
@@ -47,11 +52,21 @@ class UnsMqttHistorian:
             transport=MQTTConfig.transport,
             reconnect_on_failure=MQTTConfig.reconnect_on_failure,
         )
+        # persistence runs on a dedicated event loop so that the MQTT network thread is not blocked by the database
+        self._loop = asyncio.new_event_loop()
+        self._loop_thread = threading.Thread(target=self._loop.run_forever, name=f"{self.client_id}-loop", daemon=True)
+        self._loop_thread.start()
+        # messages queued till they are persisted as a batch. tuples of (client_id, topic, timestamp, message)
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=HistorianConfig.queue_size)
+        self._persist_task: asyncio.Future = asyncio.run_coroutine_threadsafe(self._persist_batches(), self._loop)
+        # hash of the last payload persisted per topic, used to skip duplicates if HistorianConfig.skip_duplicates
+        # ordered from the least to the most recently received topic
+        self._last_payload_hash: OrderedDict[str, int] = OrderedDict()
         # Callback messages
         self.uns_client.on_message = self.on_message
         self.uns_client.on_disconnect = self.on_disconnect
-        loop = asyncio.get_event_loop()
-        loop.run_until_complete(HistorianHandler.get_shared_pool())
+        # the pool is bound to the event loop it was created in
+        self.run_async(HistorianHandler.get_shared_pool())
         self.uns_client.run(
             host=MQTTConfig.host,
             port=MQTTConfig.port,
@@ -71,24 +86,35 @@ class UnsMqttHistorian:
             client), str(userdata), str(msg))
 
         try:
+            payload_hash = None
+            if HistorianConfig.skip_duplicates:
+                payload_hash = hash(msg.payload)
+                if self._last_payload_hash.get(msg.topic) == payload_hash:
+                    LOGGER.debug("Skipping duplicate message on topic: %s", msg.topic)
+                    self._last_payload_hash.move_to_end(msg.topic)
+                    return
             # get the payload as a dict object
             filtered_message = self.uns_client.get_payload_as_dict(
                 topic=msg.topic, payload=msg.payload, mqtt_ignored_attributes=MQTTConfig.ignored_attributes
             )
 
-            # Async Historian persistence method
-            async def run_async_handler():
-                async with HistorianHandler() as uns_historian_handler:
-                    await uns_historian_handler.persist_mqtt_msg(
-                        client_id=client._client_id.decode(),
-                        topic=msg.topic,
-                        timestamp=float(filtered_message.get(
-                            MQTTConfig.timestamp_key, time.time())),
-                        message=filtered_message,
+            # hand over to the event loop of the historian. blocks only if the queue is full to apply back pressure
+            self.run_async(
+                self._queue.put(
+                    (
+                        client._client_id.decode(),
+                        msg.topic,
+                        float(filtered_message.get(MQTTConfig.timestamp_key, time.time())),
+                        filtered_message,
                     )
-
-            loop = asyncio.get_event_loop()
-            loop.run_until_complete(run_async_handler())
+                )
+            )
+            # recorded only once queued so that a message which failed can be processed again when redelivered
+            if payload_hash is not None:
+                self._last_payload_hash[msg.topic] = payload_hash
+                self._last_payload_hash.move_to_end(msg.topic)
+                if len(self._last_payload_hash) > MAX_TOPICS_FOR_DUPLICATE_CHECK:
+                    self._last_payload_hash.popitem(last=False)
 
         except SystemError as system_error:
             LOGGER.error(
@@ -125,6 +151,78 @@ class UnsMqttHistorian:
                 reason_codes), stack_info=True, exc_info=True)
         # dont close the DB Pool as the client may disconnect multiple times and reconnect
 
+    def run_async(self, coroutine):
+        """
+        Runs the coroutine on the event loop of the historian and waits for the result
+        """
+        return asyncio.run_coroutine_threadsafe(coroutine, self._loop).result()
+
+    async def _persist_batches(self):
+        """
+        Drains the queue into batches of upto batch_size messages or the messages received within flush_interval
+        and persists each batch to the Historian
+        """
+        while True:
+            messages: list[tuple] = [await self._queue.get()]
+            deadline = self._loop.time() + HistorianConfig.flush_interval
+            while len(messages) < HistorianConfig.batch_size:
+                timeout = deadline - self._loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    messages.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except TimeoutError:
+                    break
+            try:
+                async with HistorianHandler() as uns_historian_handler:
+                    await uns_historian_handler.persist_mqtt_msgs(messages)
+            except Exception as ex:
+                # a single bad message fails the whole batch, hence persist the messages one at a time so only it is lost
+                LOGGER.warning("Error persisting %d messages as a batch, retrying one at a time: %s", len(messages), str(ex))
+                await self._persist_one_by_one(messages)
+            finally:
+                for _ in messages:
+                    self._queue.task_done()
+
+    async def _persist_one_by_one(self, messages: list[tuple]):
+        """
+        Persists each message on its own, logging the messages which could not be persisted
+        """
+        for client_id, topic, timestamp, message in messages:
+            try:
+                async with HistorianHandler() as uns_historian_handler:
+                    await uns_historian_handler.persist_mqtt_msg(
+                        client_id=client_id, topic=topic, timestamp=timestamp, message=message
+                    )
+            except Exception as ex:  # noqa: PERF203
+                LOGGER.error(
+                    "Error persisting the message to the Historian DB: %s\nTopic: %s \nMessage:%s",
+                    str(ex),
+                    topic,
+                    message,
+                    stack_info=True,
+                    exc_info=True,
+                )
+
+    def wait_for_pending(self):
+        """
+        Waits till all the queued messages have been persisted
+        """
+        self.run_async(self._queue.join())
+
+    def close(self):
+        """
+        Persists the queued messages, closes the DB Pool and stops the event loop of the historian
+        """
+        self.wait_for_pending()
+        self._persist_task.cancel()
+        try:
+            self.run_async(HistorianHandler.close_pool())
+        finally:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._loop_thread.join()
+            self._loop.close()
+
 
 def main():
     """
@@ -137,8 +235,7 @@ def main():
     finally:
         if uns_mqtt_historian is not None:
             uns_mqtt_historian.uns_client.disconnect()
-        loop = asyncio.get_event_loop()
-        loop.run_until_complete(HistorianHandler.close_pool())
+            uns_mqtt_historian.close()
 
 
 if __name__ == "__main__":
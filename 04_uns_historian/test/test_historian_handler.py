@@ -20,6 +20,7 @@ Test cases for historian_handler
 
 import asyncio
 import json
+import time
 from datetime import UTC, datetime
 from unittest.mock import AsyncMock, patch
 
@@ -56,6 +57,9 @@ async def test_shared_pool(mock_asyncpg):
 
     assert pool1 is pool2
     mock_asyncpg.assert_called_once()
+    # the pool is sized as per the configuration
+    assert mock_asyncpg.call_args.kwargs["min_size"] == HistorianConfig.pool_min_size
+    assert mock_asyncpg.call_args.kwargs["max_size"] == HistorianConfig.pool_max_size
 
 
 @pytest.mark.asyncio(loop_scope="session")
@@ -181,3 +185,76 @@ async def test_execute_prepared(
             assert True  # Error was expected because of incorrect params
         else:
             pytest.fail(f"Exception occurred while persisting Exception {ex}")
+
+
+@pytest.mark.parametrize(
+    "timestamp, expected",
+    [
+        (1701232000, 1701232000.0),
+        (1701232000123.5, 1701232000123.5),
+    ],
+)
+def test_get_timestamp_in_ms(timestamp: float, expected: float):
+    """
+    Test case for HistorianHandler#get_timestamp_in_ms
+    """
+    assert HistorianHandler.get_timestamp_in_ms(timestamp) == expected
+    # current time is used when the timestamp is not provided
+    current_time = time.time() * 1000
+    assert current_time <= HistorianHandler.get_timestamp_in_ms(None)
+
+
+@pytest.mark.parametrize(
+    "message",
+    [
+        {"key1": "value1"},
+        {"key2": "value2", "key3": 10, "nested": {"list": [1, 2.5, True, None]}},
+        "I am not a json dict",
+        1234,
+        # beyond the 64 bit integers supported by orjson
+        {"big_int": 2**70, "negative_big_int": -(2**70)},
+    ],
+)
+def test_serialize_message(message):
+    """
+    Test case for HistorianHandler#serialize_message being compatible with json
+    """
+    assert json.loads(HistorianHandler.serialize_message(message)) == message
+
+
+@pytest.mark.asyncio(loop_scope="session")
+@pytest.mark.integrationtest
+# FIXME not working with VsCode https://github.com/microsoft/vscode-python/issues/19374
+# Comment this marker and run test individually in VSCode. Uncomment for running from command line / CI
+@pytest.mark.xdist_group(name="uns_historian")
+@pytest.mark.parametrize(
+    "messages",
+    [
+        [
+            ("historian_batch_client1", "a/b/c", 1701232000, {"key1": "value1"}),
+            ("historian_batch_client1", "a/b/d", None, {"key2": "value2", "key3": 10}),
+            ("historian_batch_client1", "topic1", 1701234700, "I am not a json dict"),
+        ],
+        [],
+    ],
+)
+async def test_persist_mqtt_msgs(
+    historian_pool,  # noqa: ARG001 fixture defined in ./conftest.py
+    messages: list[tuple],
+):
+    select_sql_cmd = f"SELECT * FROM {HistorianConfig.table} WHERE client_id = $1 AND topic = $2 AND mqtt_msg = $3;"  # noqa: S608
+    try:
+        async with HistorianHandler() as uns_historian_writer:
+            await uns_historian_writer.persist_mqtt_msgs(messages)
+
+        for client_id, topic, _timestamp, message in messages:
+            async with HistorianHandler() as uns_historian_reader:
+                result = await uns_historian_reader.execute_prepared(select_sql_cmd, *[client_id, topic, json.dumps(message)])
+            assert len(result) == 1, f"Should have gotten one record for topic:{topic}"
+
+    except asyncpg.PostgresError as ex:
+        pytest.fail(f"Exception occurred while persisting Exception {ex}")
+    finally:
+        async with HistorianHandler() as uns_historian_handler_cleaner:
+            delete_sql_cmd = f"DELETE FROM {HistorianConfig.table} WHERE client_id = $1 RETURNING *;"  # noqa: S608
+            await uns_historian_handler_cleaner.execute_prepared(delete_sql_cmd, "historian_batch_client1")
@@ -22,7 +22,7 @@ import asyncio
 import json
 import random
 import time
-from unittest.mock import patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 import pytest_asyncio
@@ -52,6 +52,16 @@ def mock_historian_handler():
     loop.close()
 
 
+@pytest.fixture
+def uns_mqtt_historian(mock_uns_client, mock_historian_handler):  # noqa: ARG001
+    uns_mqtt_historian = UnsMqttHistorian()
+    # tests may replace the queue with a mock, hence keep the real one to stop the historian cleanly
+    queue = uns_mqtt_historian._queue
+    yield uns_mqtt_historian
+    uns_mqtt_historian._queue = queue
+    uns_mqtt_historian.close()
+
+
 def test_uns_mqtt_disconnect_historian_close_pool(mock_uns_client, mock_historian_handler):  # noqa: ARG001
     uns_mqtt_historian = UnsMqttHistorian()
     # simulate the disconnection by calling the callback directly
@@ -81,6 +91,82 @@ def test_uns_mqtt_historian_main_negative_pool_closure(mock_uns_client, mock_his
         mock_historian_handler.close_pool.assert_called_once()
 
 
+def test_uns_mqtt_historian_skip_duplicates(uns_mqtt_historian: UnsMqttHistorian):
+    # verify that only the first of identical payloads on a topic is processed when skip_duplicates is set
+    uns_mqtt_historian.uns_client.get_payload_as_dict.return_value = {"key1": "value1"}
+    uns_mqtt_historian._queue = AsyncMock(spec=asyncio.Queue)
+    client = MagicMock(_client_id=b"test_client")
+    with patch.object(HistorianConfig, "skip_duplicates", True):
+        for topic, payload in [("a/b", b"payload1"), ("a/b", b"payload1"), ("a/c", b"payload1"), ("a/b", b"payload2")]:
+            uns_mqtt_historian.on_message(client, None, MagicMock(topic=topic, payload=payload))
+
+    assert uns_mqtt_historian.uns_client.get_payload_as_dict.call_count == 3
+    assert uns_mqtt_historian._queue.put.await_count == 3
+
+
+def test_uns_mqtt_historian_skip_duplicates_after_failure(uns_mqtt_historian: UnsMqttHistorian):
+    # verify that a message which could not be queued is processed again when redelivered
+    uns_mqtt_historian.uns_client.get_payload_as_dict.side_effect = [Exception("Mocked parse error"), {"key1": "value1"}]
+    uns_mqtt_historian._queue = AsyncMock(spec=asyncio.Queue)
+    client = MagicMock(_client_id=b"test_client")
+    with patch.object(HistorianConfig, "skip_duplicates", True):
+        for _ in range(2):
+            uns_mqtt_historian.on_message(client, None, MagicMock(topic="a/b", payload=b"payload1"))
+
+    assert uns_mqtt_historian._queue.put.await_count == 1
+    uns_mqtt_historian.uns_client.get_payload_as_dict.side_effect = None
+
+
+def test_uns_mqtt_historian_skip_duplicates_bounded(uns_mqtt_historian: UnsMqttHistorian):
+    # verify that the payload hash is kept only for the most recently received topics
+    uns_mqtt_historian.uns_client.get_payload_as_dict.return_value = {"key1": "value1"}
+    uns_mqtt_historian._queue = AsyncMock(spec=asyncio.Queue)
+    client = MagicMock(_client_id=b"test_client")
+    with (
+        patch.object(HistorianConfig, "skip_duplicates", True),
+        patch("uns_historian.uns_mqtt_historian.MAX_TOPICS_FOR_DUPLICATE_CHECK", 2),
+    ):
+        for topic in ["a/b", "a/c", "a/b", "a/d"]:
+            uns_mqtt_historian.on_message(client, None, MagicMock(topic=topic, payload=b"payload1"))
+
+    # a/c was dropped as the least recently received topic when a/d was received
+    assert list(uns_mqtt_historian._last_payload_hash) == ["a/b", "a/d"]
+
+
+def test_uns_mqtt_historian_failed_batch_persisted_one_by_one(mock_uns_client, mock_historian_handler):  # noqa: ARG001
+    # verify that when a batch fails, the messages are persisted one at a time so that only the bad message is lost
+    uns_mqtt_historian = UnsMqttHistorian()
+    mock_historian_handler.reset_mock()
+    handler = mock_historian_handler.return_value
+    # the mock is shared by the session, hence restore its state at the end of the test
+    aenter_return_value = handler.__aenter__.return_value
+    handler.__aenter__.return_value = handler
+    handler.persist_mqtt_msgs.side_effect = Exception("Mocked batch error")
+    handler.persist_mqtt_msg.side_effect = [None, Exception("Mocked bad message"), None]
+    messages = [("client", f"a/b/{index}", 1701129600000.0, {"key": index}) for index in range(3)]
+
+    async def queue_messages():
+        await asyncio.gather(*(uns_mqtt_historian._queue.put(message) for message in messages))
+
+    try:
+        with patch.object(HistorianConfig, "flush_interval", 0.01):
+            # queue all the messages in one go so that they are drained into the same batch
+            uns_mqtt_historian.run_async(queue_messages())
+            uns_mqtt_historian.wait_for_pending()
+
+        handler.persist_mqtt_msgs.assert_awaited_once_with(messages)
+        assert [mock_call.kwargs["topic"] for mock_call in handler.persist_mqtt_msg.await_args_list] == [
+            "a/b/0",
+            "a/b/1",
+            "a/b/2",
+        ]
+    finally:
+        uns_mqtt_historian.close()
+        handler.persist_mqtt_msgs.side_effect = None
+        handler.persist_mqtt_msg.side_effect = None
+        handler.__aenter__.return_value = aenter_return_value
+
+
 # test data_list :  [{topic,[messages]}]
 # ensure that the topics mentioned here align with settings.yaml
 test_data_list: list[dict[str, list[dict | bytes | str]]] = [
@@ -170,15 +256,12 @@ def test_uns_mqtt_historian(clean_up_database, topic: str, messages: list):  # n
         uns_mqtt_historian = UnsMqttHistorian()
         mgs_received: list = []
         old_on_message = uns_mqtt_historian.uns_client.on_message
-        # Loop inside on_message_decorator is null for some reason. hence trying to set outer loop in callback
-        loop = asyncio.get_event_loop()
 
         def on_message_decorator(client, userdata, msg):
             """
             Override / wrap the existing on_message callback so that
             we can track the messages were processed
             """
-            asyncio.set_event_loop(loop)
             old_on_message(client, userdata, msg)
             mgs_received.append(msg)
 
@@ -207,6 +290,8 @@ def test_uns_mqtt_historian(clean_up_database, topic: str, messages: list):  # n
         # disconnect the historian listener to free the asyncio loop
         uns_mqtt_historian.uns_client.disconnect()
         uns_mqtt_historian.uns_client.loop_stop()
+        # wait for the queued messages to have been persisted
+        uns_mqtt_historian.wait_for_pending()
         # connect to the database and validate
         select_query = f""" SELECT * FROM {HistorianConfig.table} WHERE
                                topic = $1 AND
@@ -222,7 +307,8 @@ def test_uns_mqtt_historian(clean_up_database, topic: str, messages: list):  # n
             if type(message) is bytes:
                 message = convert_spb_bytes_payload_to_dict(message)
 
-            result = loop.run_until_complete(
+            # the shared pool is bound to the event loop of the historian
+            result = uns_mqtt_historian.run_async(
                 execute_prepared_async(select_query, topic, message, uns_mqtt_historian.client_id)
             )
 
@@ -234,3 +320,5 @@ def test_uns_mqtt_historian(clean_up_database, topic: str, messages: list):  # n
         uns_publisher.publish(topic=topic, payload=b"", qos=2, retain=True, properties=publish_properties)
         uns_publisher.disconnect()
         uns_mqtt_historian.uns_client.disconnect()
+        # close the pool as it is bound to the event loop of the historian
+        uns_mqtt_historian.close()
@@ -48,8 +48,11 @@ class MQTTConfig:
     version_code: Literal[MQTTVersion.MQTTv5, MQTTVersion.MQTTv311, MQTTVersion.MQTTv31] = settings.get(
         "mqtt.version", MQTTVersion.MQTTv5
     )
-    qos: Literal[0, 1, 2] = settings.get("mqtt.qos", 2)
+    qos: Literal[0, 1, 2] = settings.get("mqtt.qos", 1)
     reconnect_on_failure: bool = settings.get("mqtt.reconnect_on_failure", True)
+    # the delay between reconnection attempts doubles from reconnect_min_delay upto reconnect_max_delay seconds
+    reconnect_min_delay: int = settings.get("mqtt.reconnect_min_delay", 1)
+    reconnect_max_delay: int = settings.get("mqtt.reconnect_max_delay", 120)
     clean_session: Optional[bool] = settings.get("mqtt.clean_session", None)
 
     host: str = settings.get("mqtt.host")
@@ -67,6 +70,11 @@ class MQTTConfig:
         LOGGER.error(
             "MQTT Host not provided. Update key 'mqtt.host' in '../../conf/settings.yaml'",
         )
+    if qos == 2:
+        LOGGER.warning(
+            "MQTT QoS 2 needs a four step handshake per message which limits the subscription throughput. "
+            "Consider 'mqtt.qos' 1 unless exactly once delivery is required",
+        )
 
     @classmethod
     def is_config_valid(cls) -> bool:
@@ -75,3 +83,13 @@ class MQTTConfig:
         Does not check if the values provided are correct or not
         """
         return cls.host is not None
+
+
+class SPBConfig:
+    """
+    Read the configurations for processing the SparkplugB messages
+    """
+
+    # maximum number of messages queued for transformation. the MQTT client waits when the queue is full
+    # the sparkplugb block in settings.yaml may have no keys, in which case dynaconf reads it as None
+    queue_size: int = (settings.get("sparkplugb") or {}).get("queue_size", 10000)
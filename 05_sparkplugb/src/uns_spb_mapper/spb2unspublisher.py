@@ -117,7 +117,7 @@ class Spb2UNSPublisher:
         metric_alias_cache_key: str = group_id + "/" + edge_node_id + "/" + str(device_id)  # as device_id may be None
         match message_type:
             case "NBIRTH" | "NDEATH" | "DBIRTH":
-                LOGGER.debug("Received message type : %s", str(message_type))
+                LOGGER.debug("Received message type : %s", message_type)
                 # reset all metric aliases on node birth
                 self.clear_metric_alias(metric_alias_cache_key)
 
@@ -133,7 +133,7 @@ class Spb2UNSPublisher:
                 # clear any alias cache
                 self.clear_metric_alias(metric_alias_cache_key)
 
-                LOGGER.debug("Received message type : %s", str(message_type))
+                LOGGER.debug("Received message type : %s", message_type)
                 # at device death there are no metrics published
 
             case "NDATA" | "NCMD" | "DDATA" | "DCMD":  # Node data message.
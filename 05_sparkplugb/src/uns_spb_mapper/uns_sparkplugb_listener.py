@@ -19,16 +19,22 @@ MQTT listener that listens to SparkplugB name space for messages and publishes t
 """
 
 import logging
-import random
-import time
+import queue
+import re
+import secrets
+import threading
 
 from uns_mqtt.mqtt_listener import UnsMQTTClient
 
-from uns_spb_mapper.sparkplugb_enc_config import MQTTConfig
+from uns_spb_mapper.sparkplugb_enc_config import MQTTConfig, SPBConfig
 from uns_spb_mapper.spb2unspublisher import Spb2UNSPublisher
 
 LOGGER = logging.getLogger(__name__)
 
+# sPB topic structure spBv1.0/<group_id>/<message_type>/<edge_node_id>/<[device_id]>
+# device_id is optional. all others are mandatory
+SPB_TOPIC_REGEX = re.compile(rf"^{re.escape(UnsMQTTClient.SPARKPLUG_NS)}([^/]+)/([^/]+)/([^/]+)(?:/([^/]+))?$")
+
 
 # listens to SparkplugB name space for messages and publishes to ISA-95
 # https://www.hivemq.com/solutions/manufacturing/smart-manufacturing-using-isa95-mqtt-sparkplug-and-uns/
@@ -43,7 +49,7 @@ class UNSSparkPlugBMapper:
         """
         self.uns_client: UnsMQTTClient = None
 
-        self.client_id = f"uns_sparkplugb_listener-{time.time()}-{random.randint(0, 1000)}"  # noqa: S311
+        self.client_id = f"uns_sparkplugb_listener-{secrets.token_hex(8)}"
 
         self.uns_client: UnsMQTTClient = UnsMQTTClient(
             client_id=self.client_id,
@@ -54,10 +60,20 @@ class UNSSparkPlugBMapper:
             reconnect_on_failure=MQTTConfig.reconnect_on_failure,
         )
 
+        # back off exponentially between reconnection attempts so that a restarting broker is not flooded
+        self.uns_client.reconnect_delay_set(
+            min_delay=MQTTConfig.reconnect_min_delay, max_delay=MQTTConfig.reconnect_max_delay
+        )
         self.uns_client.on_message = self.on_message
         self.uns_client.on_disconnect = self.on_disconnect
 
         self.spb_2_uns_pub: Spb2UNSPublisher = Spb2UNSPublisher(self.uns_client)
+        # messages are transformed and published on a dedicated thread so that the MQTT network thread is not blocked.
+        # a single thread keeps the order of the messages which the metric aliases of Spb2UNSPublisher depend on.
+        # tuples of (payload, group_id, message_type, edge_node_id, device_id)
+        self._queue: queue.Queue = queue.Queue(maxsize=SPBConfig.queue_size)
+        self._worker = threading.Thread(target=self._transform_and_publish, name=f"{self.client_id}-worker", daemon=True)
+        self._worker.start()
         self.uns_client.run(
             host=MQTTConfig.host,
             port=MQTTConfig.port,
@@ -73,37 +89,49 @@ class UNSSparkPlugBMapper:
         """
         Callback function executed every time a message is received by the subscriber
         """
-        LOGGER.debug("{" "Client: %s," "Userdata: %s," "Message: %s," "}", str(client), str(userdata), str(msg))
+        if LOGGER.isEnabledFor(logging.DEBUG):
+            LOGGER.debug("{" "Client: %s," "Userdata: %s," "Message: %s," "}", client, userdata, msg)
         try:
             if msg.topic.startswith(UnsMQTTClient.SPARKPLUG_NS):
-                topic_path: list[str] = msg.topic.split("/")
-                # sPB topic structure spBv1.0/<group_id>/<message_type>/<edge_node_id>/<[device_id]>
-                # device_id is optional. all others are mandatory
-                if len(topic_path) >= 4:
-                    group_id = topic_path[1]
-                    message_type = topic_path[2]
-                    edge_node_id = topic_path[3]
-                    device_id = None
-                    if len(topic_path) == 5:
-                        device_id = topic_path[4]
-                    else:
-                        raise ValueError(
-                            f"Unknown SparkplugB topic received: {msg.topic}."
-                            + f"Depth of tree should not be more than 5, got {len(topic_path)}",
-                        )
-                    self.spb_2_uns_pub.transform_spb_and_publish_to_uns(
-                        msg.payload, group_id, message_type, edge_node_id, device_id
-                    )
+                topic_match = SPB_TOPIC_REGEX.match(msg.topic)
+                if topic_match is not None:
+                    # device_id is None for messages of the edge node
+                    group_id, message_type, edge_node_id, device_id = topic_match.groups()
+                    # blocks only if the queue is full to apply back pressure
+                    self._queue.put((msg.payload, group_id, message_type, edge_node_id, device_id))
                 else:
                     LOGGER.error("Message received on an Unknown/non compliant SparkplugB topic: %s", msg.topic)
             else:
                 LOGGER.warning("Subscribed to a  non SparkplugB topic: %s. Message ignored", msg.topic)
-        except SystemError as system_error:
-            LOGGER.error("Fatal Error while parsing Message: %s. Exiting", str(system_error), stack_info=True, exc_info=True)
-            # raise system_error
         except Exception as ex:
             # pylint: disable=broad-exception-caught
-            LOGGER.error("Error parsing SparkplugB message payload: %s", str(ex), stack_info=True, exc_info=True)
+            LOGGER.error("Error queuing SparkplugB message: %s", str(ex), stack_info=True, exc_info=True)
+
+    def _transform_and_publish(self):
+        """
+        Transforms the queued SparkplugB messages and publishes them to the UNS. Returns once None is received from the queue
+        """
+        while (message := self._queue.get()) is not None:
+            try:
+                self.spb_2_uns_pub.transform_spb_and_publish_to_uns(*message)
+            except SystemError as system_error:  # noqa: PERF203
+                LOGGER.error(
+                    "Fatal Error while parsing Message: %s. Exiting", str(system_error), stack_info=True, exc_info=True
+                )
+            except Exception as ex:
+                # pylint: disable=broad-exception-caught
+                LOGGER.error("Error parsing SparkplugB message payload: %s", str(ex), stack_info=True, exc_info=True)
+            finally:
+                self._queue.task_done()
+        self._queue.task_done()
+
+    def close(self):
+        """
+        Publishes the queued messages and stops the thread transforming them
+        """
+        # None signals the end of the queue after the messages already queued have been processed
+        self._queue.put(None)
+        self._worker.join()
 
     def on_disconnect(
         self,
@@ -132,7 +160,10 @@ def main():
         uns_spb_mapper.uns_client.loop_forever(retry_first_connection=True)
     finally:
         if uns_spb_mapper is not None:
-            uns_spb_mapper.uns_client.disconnect()
+            try:
+                uns_spb_mapper.close()
+            finally:
+                uns_spb_mapper.uns_client.disconnect()
 
 
 if __name__ == "__main__":
@@ -25,7 +25,7 @@ from pathlib import Path
 import pytest
 from uns_mqtt.mqtt_listener import MQTTVersion, UnsMQTTClient
 
-from uns_spb_mapper.sparkplugb_enc_config import MQTTConfig, settings
+from uns_spb_mapper.sparkplugb_enc_config import MQTTConfig, SPBConfig, settings
 
 is_configs_provided: bool = settings.get("mqtt.host") is not None
 
@@ -57,6 +57,11 @@ def test_mqtt_config():
         False,
     ), f"Invalid value for key 'mqtt.reconnect_on_failure'{MQTTConfig.reconnect_on_failure}"
 
+    assert 0 < MQTTConfig.reconnect_min_delay <= MQTTConfig.reconnect_max_delay, (
+        f"'mqtt.reconnect_min_delay':{MQTTConfig.reconnect_min_delay} must be positive and "
+        f"not more than 'mqtt.reconnect_max_delay':{MQTTConfig.reconnect_max_delay}"
+    )
+
     assert MQTTConfig.clean_session in (
         None,
         True,
@@ -105,6 +110,15 @@ def test_mqtt_config():
     ), f"Configuration 'mqtt.timestamp_attribute':{MQTTConfig.timestamp_key } is not a valid JSON key"
 
 
+def test_spb_config():
+    """
+    Test if the sparkplugb configurations are valid
+    """
+    assert (
+        isinstance(SPBConfig.queue_size, int) and SPBConfig.queue_size > 0
+    ), f"'sparkplugb.queue_size':{SPBConfig.queue_size} must be a positive integer"
+
+
 @pytest.mark.integrationtest()
 def test_connectivity_to_mqtt():
     """
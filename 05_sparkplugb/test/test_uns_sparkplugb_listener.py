@@ -0,0 +1,81 @@
+"""*******************************************************************************
+* Copyright (c) 2021 Ashwin Krishnan
+*
+* All rights reserved. This program and the accompanying materials
+* are made available under the terms of MIT and  is provided "as is",
+* without warranty of any kind, express or implied, including but
+* not limited to the warranties of merchantability, fitness for a
+* particular purpose and noninfringement. In no event shall the
+* authors, contributors or copyright holders be liable for any claim,
+* damages or other liability, whether in an action of contract,
+* tort or otherwise, arising from, out of or in connection with the software
+* or the use or other dealings in the software.
+*
+* Contributors:
+*    -
+*******************************************************************************
+
+Test cases for uns_sparkplugb_listener
+"""
+
+from unittest.mock import MagicMock, call, patch
+
+import pytest
+from uns_mqtt.mqtt_listener import UnsMQTTClient
+
+from uns_spb_mapper.uns_sparkplugb_listener import UNSSparkPlugBMapper, main
+
+
+@pytest.fixture
+def mock_uns_client():
+    with patch("uns_spb_mapper.uns_sparkplugb_listener.UnsMQTTClient", autospec=True) as mock_client:
+        mock_client.SPARKPLUG_NS = UnsMQTTClient.SPARKPLUG_NS
+        yield mock_client
+
+
+@pytest.fixture
+def mock_spb_publisher():
+    with patch("uns_spb_mapper.uns_sparkplugb_listener.Spb2UNSPublisher", autospec=True) as mock_publisher:
+        yield mock_publisher
+
+
+def test_on_message_queues_and_publishes_in_order(mock_uns_client, mock_spb_publisher):  # noqa: ARG001
+    uns_spb_mapper = UNSSparkPlugBMapper()
+    for topic, payload in [
+        ("spBv1.0/uns_group/NBIRTH/eon1", b"payload1"),
+        ("spBv1.0/uns_group/DDATA/eon1/dev1", b"payload2"),
+        ("a/b/c", b"ignored, not a SparkplugB topic"),
+        ("spBv1.0/uns_group/NDATA", b"ignored, non compliant SparkplugB topic"),
+        ("spBv1.0/uns_group/NDATA/eon1", b"payload3"),
+    ]:
+        uns_spb_mapper.on_message(uns_spb_mapper.uns_client, None, MagicMock(topic=topic, payload=payload))
+    # close() returns only after the queued messages have been published
+    uns_spb_mapper.close()
+
+    assert not uns_spb_mapper._worker.is_alive()
+    assert uns_spb_mapper.spb_2_uns_pub.transform_spb_and_publish_to_uns.call_args_list == [
+        call(b"payload1", "uns_group", "NBIRTH", "eon1", None),
+        call(b"payload2", "uns_group", "DDATA", "eon1", "dev1"),
+        call(b"payload3", "uns_group", "NDATA", "eon1", None),
+    ]
+
+
+def test_transform_error_does_not_stop_worker(mock_uns_client, mock_spb_publisher):  # noqa: ARG001
+    uns_spb_mapper = UNSSparkPlugBMapper()
+    uns_spb_mapper.spb_2_uns_pub.transform_spb_and_publish_to_uns.side_effect = [ValueError("Mocked parse error"), None]
+    for payload in [b"bad payload", b"good payload"]:
+        uns_spb_mapper.on_message(
+            uns_spb_mapper.uns_client, None, MagicMock(topic="spBv1.0/uns_group/NDATA/eon1", payload=payload)
+        )
+    uns_spb_mapper.close()
+
+    assert uns_spb_mapper.spb_2_uns_pub.transform_spb_and_publish_to_uns.call_count == 2
+
+
+def test_main_closes_on_error(mock_uns_client, mock_spb_publisher):  # noqa: ARG001
+    # verify that the worker is stopped and the client disconnected even if exceptions were raised
+    mock_uns_client.return_value.loop_forever.side_effect = Exception("Mocked MQTT Error")
+    with patch.object(UNSSparkPlugBMapper, "close", autospec=True) as mock_close, pytest.raises(Exception, match="Mocked"):
+        main()
+    mock_close.assert_called_once()
+    mock_uns_client.return_value.disconnect.assert_called_once()
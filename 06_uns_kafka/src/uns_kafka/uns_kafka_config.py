@@ -49,7 +49,7 @@ class MQTTConfig:
     version: Literal[MQTTVersion.MQTTv5, MQTTVersion.MQTTv311, MQTTVersion.MQTTv31] = settings.get(
         "mqtt.version", MQTTVersion.MQTTv5
     )
-    qos: Literal[0, 1, 2] = settings.get("mqtt.qos", 2)
+    qos: Literal[0, 1, 2] = settings.get("mqtt.qos", 1)
     reconnect_on_failure: bool = settings.get("mqtt.reconnect_on_failure", True)
     clean_session: Optional[bool] = settings.get("mqtt.clean_session", None)
 
@@ -68,6 +68,11 @@ class MQTTConfig:
         LOGGER.error(
             "MQTT Host not provided. Update key 'mqtt.host' in '../../conf/settings.yaml'",
         )
+    if qos == 2:
+        LOGGER.warning(
+            "MQTT QoS 2 needs a four step handshake per message which limits the subscription throughput. "
+            "Consider 'mqtt.qos' 1 unless exactly once delivery is required",
+        )
 
     @classmethod
     def is_config_valid(cls) -> bool:
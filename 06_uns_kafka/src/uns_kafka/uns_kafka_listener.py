@@ -19,8 +19,7 @@ MQTT listener that listens to UNS namespace for messages and publishes to corres
 """
 
 import logging
-import random
-import time
+import secrets
 
 from uns_mqtt.mqtt_listener import UnsMQTTClient
 
@@ -41,7 +40,7 @@ class UNSKafkaMapper:
         """
         self.uns_client: UnsMQTTClient = None
         # generate client ID with pub prefix randomly
-        self.client_id = f"uns_kafka_listener-{time.time()}-{random.randint(0, 1000)}"  # noqa: S311
+        self.client_id = f"uns_kafka_listener-{secrets.token_hex(8)}"
 
         self.uns_client: UnsMQTTClient = UnsMQTTClient(
             client_id=self.client_id,
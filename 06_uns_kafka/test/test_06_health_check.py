@@ -24,8 +24,11 @@ def test_check_process():
     with patch("psutil.process_iter") as mock_process_iter:
         uns_kafka_process = MagicMock(spec=psutil.Process, autospec=True)
         uns_kafka_process.info = {"cmdline": ["python", "uns_kafka_mapper"]}
+        inaccessible_process = MagicMock(spec=psutil.Process, autospec=True)
+        inaccessible_process.info = {"cmdline": None}
         mock_process_iter.return_value = [
             MagicMock(),
+            inaccessible_process,
             uns_kafka_process,
             MagicMock(),
         ]
@@ -117,6 +120,8 @@ def test_main_multiple_scenarios(process_info: dict, remote_host_port_list: list
             mock_conn_list.append(mock_conn)
         mock_net_connections.return_value = mock_conn_list
         health_check.main()
+        # the connections are read once for both the MQTT and the Kafka check
+        mock_net_connections.assert_called_once_with("tcp")
         assert mock_exit.call_count == sys_err_ext_count + 1
         for i, call in enumerate(mock_exit.call_args_list):
             if i == sys_err_ext_count:  # the last call would have returned 0
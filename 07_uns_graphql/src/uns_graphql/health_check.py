@@ -13,9 +13,10 @@ logger = logging.getLogger(__name__)
 
 def check_process(name: str) -> bool:
     """Check if the process is running."""
-    for proc in psutil.process_iter(["pid", "name", "cmdline"]):
-        cmdline = proc.info.get("cmdline", [])
-        if any(name in " ".join(cmdline) for part in cmdline):
+    # only fetch the command line. it is None if the process is not accessible
+    for proc in psutil.process_iter(["cmdline"]):
+        cmdline = proc.info.get("cmdline") or []
+        if name in " ".join(cmdline):
             return True
     return False
 
@@ -23,8 +24,8 @@ def check_process(name: str) -> bool:
 def check_listening_port(port: int) -> bool:
     """Check if the current server is listening on the specified port"""
     try:
-        # Get all active network connections
-        connections = psutil.net_connections("inet")
+        # Get all active tcp connections
+        connections = psutil.net_connections("tcp")
 
         # Check if any connection matches the resolved IP and port
         for conn in connections:
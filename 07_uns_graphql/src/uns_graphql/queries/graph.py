@@ -131,6 +131,16 @@ class Query:
         WITH resultNode, fullName, $topicFilter AS topicFilter
         WHERE NONE(regex IN topicFilter WHERE fullName =~ regex) // If Topics are to be matched
     """
+    # _SEARCH_BY_PROPERTY_QUERY formatted once for each topic filter instead of on every request
+    _SEARCH_BY_PROPERTY_NO_TOPIC_QUERY = _SEARCH_BY_PROPERTY_QUERY.format(
+        UNS_LABEL_FILTER, GraphDBConfig.nested_attribute_node_type, ""
+    )
+    _SEARCH_BY_PROPERTY_INCLUDE_TOPIC_QUERY = _SEARCH_BY_PROPERTY_QUERY.format(
+        UNS_LABEL_FILTER, GraphDBConfig.nested_attribute_node_type, _FILTER_BY_TOPIC_INCLUSION_QUERY
+    )
+    _SEARCH_BY_PROPERTY_EXCLUDE_TOPIC_QUERY = _SEARCH_BY_PROPERTY_QUERY.format(
+        UNS_LABEL_FILTER, GraphDBConfig.nested_attribute_node_type, _FILTER_BY_TOPIC_EXCLUSION_QUERY
+    )
     #
     """
         Search by topic query. Parameters used in the query are
@@ -163,20 +173,21 @@ class Query:
                     WHEN idx = 0 THEN 'MATCH (N' + toString(idx) + ':' + labels + ') WHERE NOT ()-[:{NODE_RELATION_NAME}]->(N' + toString(idx) + ')'
                     ELSE 'MATCH (N' + toString(idx-1)+')-[:{NODE_RELATION_NAME}]->(N' + toString(idx) + ':' + labels + ')'
                 END
-                // Handle exact node names
+                // Handle exact node names. Passed as parameters so that the query text and plan are reused across topics
                 ELSE
                 CASE
-                    WHEN idx = 0 THEN 'MATCH (N' + toString(idx) + ':' + labels + ' {{node_name: "' + nodeNames[idx] + '"}})'
-                    ELSE 'MATCH (N' + toString(idx-1)+')-[:{NODE_RELATION_NAME}]->(N' + toString(idx) + ':' + labels + ' {{node_name: "' + nodeNames[idx] + '"}})'
+                    WHEN idx = 0 THEN 'MATCH (N' + toString(idx) + ':' + labels + ' {{node_name: $nodeNames[' + toString(idx) + ']}})'
+                    ELSE 'MATCH (N' + toString(idx-1)+')-[:{NODE_RELATION_NAME}]->(N' + toString(idx) + ':' + labels + ' {{node_name: $nodeNames[' + toString(idx) + ']}})'
                 END
             END
             ] AS queryParts
 
         // Step 2: Join the query parts into a full Cypher query
-        WITH apoc.text.join(queryParts, '') + ' RETURN N' + toString(size(nodeNames) - 1) + ' AS resultNode' AS finalQuery
+        WITH apoc.text.join(queryParts, '') + ' RETURN N' + toString(size(nodeNames) - 1) + ' AS resultNode' AS finalQuery,
+            nodeNames
 
         // Step 3: Execute the dynamically constructed query
-        CALL apoc.cypher.run(finalQuery, {{}}) YIELD  value
+        CALL apoc.cypher.run(finalQuery, {{nodeNames: nodeNames}}) YIELD  value
 
         WITH DISTINCT value.resultNode as resultNode
         // Step 4: Use APOC to find the path from each node to the root, excluding '{ GraphDBConfig.nested_attribute_node_type }' nodes
@@ -325,17 +336,14 @@ class Query:
 
         topic_regex_list: list[str] = [UnsMQTTClient.get_regex_for_topic_with_wildcard(topic.topic) for topic in topics]
 
-        topic_sub_query = None
+        final_query = None
         if len(topic_regex_list) == 0:
-            topic_sub_query = ""
+            final_query = Query._SEARCH_BY_PROPERTY_NO_TOPIC_QUERY
         elif exclude_topics:
-            topic_sub_query = Query._FILTER_BY_TOPIC_EXCLUSION_QUERY
+            final_query = Query._SEARCH_BY_PROPERTY_EXCLUDE_TOPIC_QUERY
         else:
-            topic_sub_query = Query._FILTER_BY_TOPIC_INCLUSION_QUERY
+            final_query = Query._SEARCH_BY_PROPERTY_INCLUDE_TOPIC_QUERY
 
-        final_query = Query._SEARCH_BY_PROPERTY_QUERY.format(
-            Query.UNS_LABEL_FILTER, GraphDBConfig.nested_attribute_node_type, topic_sub_query
-        )
         # Initialize the GraphDB
         graph_db = GraphDB()
         results: list[Record] = await graph_db.execute_read_query(
@@ -21,8 +21,7 @@ It provides asynchronous generators for subscribing to MQTT topics.
 
 import asyncio
 import logging
-import random
-import time
+import secrets
 import typing
 
 import strawberry
@@ -55,7 +54,7 @@ class MQTTSubscription:
             typing.AsyncGenerator[UNSMessage, None]: Asynchronously generates UNS event messages
         """
         try:
-            client_id = f"graphql-{time.time()}-{random.randint(0, 1000)}"  # noqa: S311
+            client_id = f"graphql-{secrets.token_hex(8)}"
             async with Client(
                 identifier=client_id,
                 clean_session=MQTTConfig.clean_session,
@@ -19,9 +19,11 @@ Common basetype needed across all graphQL queries and subscriptions to the UNS
 """
 
 import json
+import math
 from enum import Enum
 from typing import Union
 
+import orjson
 import strawberry
 from strawberry.scalars import JSON
 
@@ -36,12 +38,38 @@ class JSONPayload:
 
     def __init__(self, data: Union[str, dict]):
         if type(data) is str:
-            json.loads(data)
+            # validate the JSON string
+            try:
+                orjson.loads(data)
+            except orjson.JSONDecodeError:
+                # orjson rejects NaN and Infinity which json.dumps emits by default. raises json.JSONDecodeError if invalid
+                json.loads(data)
             # if it is already a JSON string then assign
             self.data = data
         else:
-            # else convert dict to JSON
-            self.data = json.dumps(data)
+            # else convert dict to JSON. OPT_NON_STR_KEYS keeps the json.dumps behaviour for non string keys
+            if _has_non_finite_float(data):
+                # orjson would silently write NaN and Infinity as null
+                self.data = json.dumps(data)
+                return
+            try:
+                self.data = orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+            except orjson.JSONEncodeError:
+                # e.g. integers beyond 64 bits
+                self.data = json.dumps(data)
+
+
+def _has_non_finite_float(value) -> bool:
+    """
+    Check if the value or any nested value is a NaN or an Infinity float
+    """
+    if isinstance(value, float):
+        return not math.isfinite(value)
+    if isinstance(value, dict):
+        return any(_has_non_finite_float(item) for item in value.values())
+    if isinstance(value, list | tuple):
+        return any(_has_non_finite_float(item) for item in value)
+    return False
 
 
 @strawberry.type
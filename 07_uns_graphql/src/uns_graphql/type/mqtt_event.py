@@ -56,11 +56,11 @@ class MQTTMessage:
         self,
         info: Info,  # noqa: ARG002
     ) -> typing.Optional[typing.Union[JSONPayload, BytesPayload]]:
-        if UnsMQTTClient.is_topic_matched(UnsMQTTClient.SPB_STATE_MSG_TYPE, self.topic):
-            # Message to sparkplug STATE message
-            return JSONPayload(data=self._raw_payload.decode("utf-8"))
-
-        elif self.topic.startswith(UnsMQTTClient.SPARKPLUG_NS):
+        if self.topic.startswith(UnsMQTTClient.SPARKPLUG_NS):
+            # the wildcard match is only needed for topics in the sparkplug name space
+            if UnsMQTTClient.is_topic_matched(UnsMQTTClient.SPB_STATE_MSG_TYPE, self.topic):
+                # Message to sparkplug STATE message
+                return JSONPayload(data=self._raw_payload.decode("utf-8"))
             # Message to sparkplug name space in protobuf i.e. BytesPayload
             return BytesPayload(data=self._raw_payload)
 
@@ -36,6 +36,17 @@ from uns_graphql.type.basetype import BytesPayload
 
 LOGGER = logging.getLogger(__name__)
 
+# datatype enums keyed by their integer value. a dict lookup is much cheaper than calling the Enum per value
+_METRIC_DATATYPES: dict[int, SPBMetricDataTypes] = {datatype.value: datatype for datatype in SPBMetricDataTypes}
+_PROPERTY_VALUE_TYPES: dict[int, SPBPropertyValueTypes] = {datatype.value: datatype for datatype in SPBPropertyValueTypes}
+_DATASET_DATATYPES: dict[int, SPBDataSetDataTypes] = {datatype.value: datatype for datatype in SPBDataSetDataTypes}
+_PARAMETER_TYPES: dict[int, SPBParameterTypes] = {datatype.value: datatype for datatype in SPBParameterTypes}
+# names of the datatypes keyed by their integer value. reading Enum.name goes through a python level descriptor
+_METRIC_DATATYPE_NAMES: dict[int, str] = {datatype.value: datatype.name for datatype in SPBMetricDataTypes}
+_PROPERTY_VALUE_TYPE_NAMES: dict[int, str] = {datatype.value: datatype.name for datatype in SPBPropertyValueTypes}
+_DATASET_DATATYPE_NAMES: dict[int, str] = {datatype.value: datatype.name for datatype in SPBDataSetDataTypes}
+_PARAMETER_TYPE_NAMES: dict[int, str] = {datatype.value: datatype.name for datatype in SPBParameterTypes}
+
 
 @strawberry.type(
     description="""Wrapper for primitive types in Sparkplug.: int, float, str, bool, list
@@ -66,14 +77,16 @@ class SPBMetadata:
     description: typing.Optional[str]
 
     def __init__(self, metadata: Payload.MetaData):
-        self.is_multi_part = metadata.is_multi_part if metadata.HasField("is_multi_part") else None
-        self.content_type = metadata.content_type if metadata.HasField("content_type") else None
-        self.size = metadata.size if metadata.HasField("size") else None
-        self.seq = metadata.seq if metadata.HasField("seq") else None
-        self.file_name = metadata.file_name if metadata.HasField("file_name") else None
-        self.file_type = metadata.file_type if metadata.HasField("file_type") else None
-        self.md5 = metadata.md5 if metadata.HasField("md5") else None
-        self.description = metadata.description if metadata.HasField("description") else None
+        # ListFields returns only the fields set in the payload, fields not set are None
+        set_fields = {field.name: value for field, value in metadata.ListFields()}
+        self.is_multi_part = set_fields.get("is_multi_part")
+        self.content_type = set_fields.get("content_type")
+        self.size = set_fields.get("size")
+        self.seq = set_fields.get("seq")
+        self.file_name = set_fields.get("file_name")
+        self.file_type = set_fields.get("file_type")
+        self.md5 = set_fields.get("md5")
+        self.description = set_fields.get("description")
 
 
 @strawberry.type
@@ -100,6 +113,15 @@ class SPBPropertySetList:
     propertysets: list[typing.Annotated[SPBPropertySet, strawberry.lazy(".sparkplugb_node")]]
 
 
+# builders of SPBPropertyValue.value for the datatypes which are not wrapped in a SPBPrimitive
+_PROPERTY_VALUE_BUILDERS: dict[int, typing.Callable[[Payload.PropertyValue], object]] = {
+    SPBPropertyValueTypes.PropertySet: lambda property_value: SPBPropertySet(property_value.propertyset_value),
+    SPBPropertyValueTypes.PropertySetList: lambda property_value: SPBPropertySetList(
+        propertysets=[SPBPropertySet(propertyset) for propertyset in property_value.propertysets_value.propertyset]
+    ),
+}
+
+
 @strawberry.type
 class SPBPropertyValue:
     """
@@ -116,24 +138,16 @@ class SPBPropertyValue:
 
     def __init__(self, property_value: Payload.PropertyValue):
         self.is_null = property_value.is_null if property_value.HasField("is_null") else None
-        self.datatype = SPBPropertyValueTypes(property_value.type).name
+        datatype = _PROPERTY_VALUE_TYPES[property_value.type]
+        self.datatype = _PROPERTY_VALUE_TYPE_NAMES[datatype]
         if self.is_null:
             self.value = None
         else:
-            match property_value.type:
-                case SPBPropertyValueTypes.PropertySet:
-                    self.value = SPBPropertySet(property_value.propertyset_value)
-
-                case SPBPropertyValueTypes.PropertySetList:
-                    self.value = SPBPropertySetList(
-                        propertysets=[
-                            SPBPropertySet(propertyset) for propertyset in property_value.propertysets_value.propertyset
-                        ]
-                    )
-                case _:
-                    self.value = SPBPrimitive(
-                        SPBPropertyValueTypes(property_value.type).get_value_from_sparkplug(property_value)
-                    )
+            builder = _PROPERTY_VALUE_BUILDERS.get(property_value.type)
+            if builder is not None:
+                self.value = builder(property_value)
+            else:
+                self.value = SPBPrimitive(datatype.get_value_from_sparkplug(property_value))
 
 
 @strawberry.type
@@ -146,8 +160,9 @@ class SPBDataSetValue:
     # graphql doesn't support Unions
     value: SPBPrimitive
 
-    def __init__(self, datatype: int, dataset_value: Payload.DataSet.DataSetValue):
-        self.datatype = SPBDataSetDataTypes(datatype)
+    def __init__(self, datatype: int | SPBDataSetDataTypes, dataset_value: Payload.DataSet.DataSetValue):
+        # the datatype is usually resolved once per column by SPBDataSet
+        self.datatype = datatype if isinstance(datatype, SPBDataSetDataTypes) else _DATASET_DATATYPES[datatype]
         self.value = SPBPrimitive(self.datatype.get_value_from_sparkplug(dataset_value))
 
 
@@ -159,7 +174,7 @@ class SPBDataSetRow:
 
     elements: list[SPBDataSetValue]
 
-    def __init__(self, datatypes: list[int], row: Payload.DataSet.Row):
+    def __init__(self, datatypes: list[int] | list[SPBDataSetDataTypes], row: Payload.DataSet.Row):
         self.elements = [
             SPBDataSetValue(datatype=datatype, dataset_value=dataset_value)
             for datatype, dataset_value in zip(datatypes, row.elements)
@@ -179,10 +194,11 @@ class SPBDataSet:
     rows: list[SPBDataSetRow]
 
     def __init__(self, dataset: Payload.DataSet):
-        self.types = [SPBDataSetDataTypes(datatype).name for datatype in dataset.types]
+        datatypes = [_DATASET_DATATYPES[datatype] for datatype in dataset.types]
+        self.types = [_DATASET_DATATYPE_NAMES[datatype] for datatype in datatypes]
         self.num_of_columns = dataset.num_of_columns
         self.columns = dataset.columns
-        self.rows = [SPBDataSetRow(datatypes=dataset.types, row=row) for row in dataset.rows]
+        self.rows = [SPBDataSetRow(datatypes=datatypes, row=row) for row in dataset.rows]
 
 
 @strawberry.type
@@ -198,8 +214,9 @@ class SPBTemplateParameter:
 
     def __init__(self, parameter: Payload.Template.Parameter) -> None:
         self.name = parameter.name
-        self.datatype = SPBParameterTypes(parameter.type).name
-        self.value = SPBPrimitive(SPBParameterTypes(parameter.type).get_value_from_sparkplug(parameter))
+        datatype = _PARAMETER_TYPES[parameter.type]
+        self.datatype = _PARAMETER_TYPE_NAMES[datatype]
+        self.value = SPBPrimitive(datatype.get_value_from_sparkplug(parameter))
 
 
 @strawberry.type
@@ -215,13 +232,23 @@ class SPBTemplate:
     is_definition: typing.Optional[bool]
 
     def __init__(self, template: Payload.Template):
-        self.version = template.version if template.HasField("version") else None
-        self.metrics = [SPBMetric(metric) for metric in template.metrics]
-        self.template_ref = template.template_ref if template.HasField("template_ref") else None
-        self.is_definition = template.is_definition if template.HasField("is_definition") else None
+        set_fields = {field.name: value for field, value in template.ListFields()}
+        self.version = set_fields.get("version")
+        self.metrics = list(map(SPBMetric, template.metrics))
+        self.template_ref = set_fields.get("template_ref")
+        self.is_definition = set_fields.get("is_definition")
         self.parameters = [SPBTemplateParameter(parameter) for parameter in template.parameters]
 
 
+# builders of SPBMetric.value for the datatypes which are not wrapped in a SPBPrimitive
+_METRIC_VALUE_BUILDERS: dict[int, typing.Callable[[Payload.Metric], object]] = {
+    SPBMetricDataTypes.Bytes: lambda metric: BytesPayload(data=metric.bytes_value),
+    SPBMetricDataTypes.File: lambda metric: BytesPayload(data=metric.bytes_value),
+    SPBMetricDataTypes.DataSet: lambda metric: SPBDataSet(metric.dataset_value),
+    SPBMetricDataTypes.Template: lambda metric: SPBTemplate(metric.template_value),
+}
+
+
 @strawberry.type
 class SPBMetric:
     """
@@ -245,32 +272,27 @@ class SPBMetric:
     ]
 
     def __init__(self, metric: Payload.Metric):
+        set_fields = {field.name: value for field, value in metric.ListFields()}
         self.name = metric.name
-        self.alias = metric.alias if metric.HasField("alias") else None
+        self.alias = set_fields.get("alias")
         # Timestamp is normally in milliseconds and needs to be converted to microsecond
         self.timestamp = datetime.fromtimestamp(metric.timestamp / 1000, UTC)
-        self.datatype = SPBMetricDataTypes(metric.datatype).name
-        self.is_historical = metric.is_historical if metric.HasField("is_historical") else None
-        self.is_transient = metric.is_transient if metric.HasField("is_transient") else None
-        self.is_null = metric.is_null if metric.HasField("is_null") else None
-        self.metadata = SPBMetadata(metric.metadata) if metric.HasField("metadata") else None
-        self.properties = SPBPropertySet(metric.properties) if metric.HasField("properties") else None
+        datatype = _METRIC_DATATYPES[metric.datatype]
+        self.datatype = _METRIC_DATATYPE_NAMES[datatype]
+        self.is_historical = set_fields.get("is_historical")
+        self.is_transient = set_fields.get("is_transient")
+        self.is_null = set_fields.get("is_null")
+        self.metadata = SPBMetadata(set_fields["metadata"]) if "metadata" in set_fields else None
+        self.properties = SPBPropertySet(set_fields["properties"]) if "properties" in set_fields else None
 
         if self.is_null:
             self.value = None
         else:
-            match metric.datatype:
-                case SPBMetricDataTypes.Bytes | SPBMetricDataTypes.File:
-                    self.value = BytesPayload(data=SPBMetricDataTypes(metric.datatype).get_value_from_sparkplug(metric))
-
-                case SPBMetricDataTypes.DataSet:
-                    self.value = SPBDataSet(SPBMetricDataTypes.DataSet.get_value_from_sparkplug(metric))
-
-                case SPBMetricDataTypes.Template:
-                    self.value = SPBTemplate(SPBMetricDataTypes.Template.get_value_from_sparkplug(metric))
-
-                case _:
-                    self.value = SPBPrimitive(SPBMetricDataTypes(metric.datatype).get_value_from_sparkplug(metric))
+            builder = _METRIC_VALUE_BUILDERS.get(datatype)
+            if builder is not None:
+                self.value = builder(metric)
+            else:
+                self.value = SPBPrimitive(datatype.get_value_from_sparkplug(metric))
 
 
 @strawberry.type
@@ -311,9 +333,7 @@ class SPBNode:
         self.topic = topic
 
         if isinstance(payload, bytes):
-            parsed_payload = Payload()
-            parsed_payload.ParseFromString(payload)
-            payload = parsed_payload
+            payload = Payload.FromString(payload)
         elif isinstance(payload, dict):
             payload = convert_dict_to_payload(payload)
         # Timestamp is normally in milliseconds and needs to be converted to microsecond
@@ -324,4 +344,4 @@ class SPBNode:
         self.uuid = strawberry.ID(payload.uuid) if payload.HasField("uuid") else None
         self.body = strawberry.scalars.Base64(payload.body) if payload.HasField("body") else None
         # The HasField method does not work for repeated fields
-        self.metrics = [SPBMetric(metric) for metric in payload.metrics]
+        self.metrics = list(map(SPBMetric, payload.metrics))
@@ -309,6 +309,9 @@ spb_result_dict: dict = {
     ],
 }
 
+# the schema is built once and shared by all the tests of the module
+graph_schema = strawberry.Schema(query=GraphQuery)
+
 # Mock the datahandler for UNS queries
 mocked_uns_graphdb = MagicMock(spec=GraphDB, autospec=True)
 # Mocking all the query functions to give the same result
@@ -475,9 +478,8 @@ async def test_strawberry_get_uns_nodes(topics: list[str], has_result_errors: bo
             }
     """
     mqtt_topics: list[dict[str, str]] = [{"topic": x} for x in topics]
-    schema = strawberry.Schema(query=GraphQuery)
     with patch("uns_graphql.queries.graph.GraphDB", return_value=mocked_uns_graphdb):
-        result = await schema.execute(query=query, variable_values={"mqtt_topics": mqtt_topics})
+        result = await graph_schema.execute(query=query, variable_values={"mqtt_topics": mqtt_topics})
         if not has_result_errors:
             assert not result.errors
         else:
@@ -523,9 +525,8 @@ async def test_strawberry_get_uns_nodes_by_property(
     mqtt_topics = None
     if topics is not None:
         mqtt_topics: list[dict[str, str]] = [{"topic": x} for x in topics]
-    schema = strawberry.Schema(query=GraphQuery)
     with patch("uns_graphql.queries.graph.GraphDB", return_value=mocked_uns_graphdb):
-        result = await schema.execute(
+        result = await graph_schema.execute(
             query=query,
             variable_values={"property_keys": property_keys, "mqtt_topics": mqtt_topics, "exclude_topics": exclude_topics},
         )
@@ -580,9 +581,8 @@ async def test_strawberry_get_spb_nodes_by_metric(metric_names: list[str], has_r
 
     }
     """
-    schema = strawberry.Schema(query=GraphQuery)
     with patch("uns_graphql.queries.graph.GraphDB", return_value=mocked_spb_graphdb):
-        result = await schema.execute(
+        result = await graph_schema.execute(
             query=query,
             variable_values={
                 "metric_names": metric_names,
@@ -49,42 +49,51 @@ test_data_set: list[DatabaseRow] = [
         json.dumps({"a": "value1", "b": [10, 23, 23, 34], "c": {"k1": "v1", "k2": 100}, "k3": "outer_v1"}),
     ),
 ]
+# the schema is built once and shared by all the tests of the module
+historian_schema = strawberry.Schema(query=HistorianQuery)
+
 # Mock the datahandler
 mocked_db_pool = MagicMock(spec=HistorianDBPool, autospec=True)
 
 # mocked_db_pool.__aiter__.return_value = mocked_db_pool
 mocked_db_pool.__aenter__.return_value = mocked_db_pool
 # Mocking all the query functions to give the same result
-mocked_db_pool.get_historic_events.return_value = [
-    HistoricalUNSEvent(timestamp=x[0], topic=x[1], publisher=x[2], payload=JSONPayload(data=x[3])) for x in test_data_set
-]
-mocked_db_pool.get_historic_events_for_property_keys.return_value = [
-    HistoricalUNSEvent(timestamp=x[0], topic=x[1], publisher=x[2], payload=JSONPayload(data=x[3])) for x in test_data_set
-]
-mocked_db_pool.execute_prepared.return_value = [
-    HistoricalUNSEvent(timestamp=x[0], topic=x[1], publisher=x[2], payload=JSONPayload(data=x[3])) for x in test_data_set
+historical_events: list[HistoricalUNSEvent] = [
+    HistoricalUNSEvent(timestamp=timestamp, topic=topic, publisher=publisher, payload=JSONPayload(data=payload))
+    for timestamp, topic, publisher, payload in test_data_set
 ]
+mocked_db_pool.get_historic_events.return_value = historical_events
+mocked_db_pool.get_historic_events_for_property_keys.return_value = historical_events
+mocked_db_pool.execute_prepared.return_value = historical_events
+
+
+def _mqtt_topic_input(topic: str) -> MQTTTopicInput:
+    return MQTTTopicInput.from_pydantic(MQTTTopic(topic=topic))
 
 
 @pytest.mark.asyncio(loop_scope="function")
 @pytest.mark.parametrize(
-    "topics, from_date, to_date, has_result_errors",
+    "mqtt_topic_list, from_date, to_date, has_result_errors",
     [
-        (["topic1/#"], datetime(2023, 11, 29, 4, 43, 20), datetime(2023, 11, 29, 11, 56, 40), False),
-        (["topic1/+"], datetime(2023, 11, 29, 4, 43, 20), datetime(2023, 11, 29, 11, 56, 40), False),
-        (["#"], None, datetime(2023, 11, 29, 11, 23, 20), False),
-        (["#"], datetime(2023, 11, 29, 11, 23, 20), None, False),
-        (["topic1/#", "topic3"], datetime(2023, 11, 29, 4, 43, 20), datetime(2023, 11, 29, 11, 56, 40), False),
-        (["+"], None, None, False),
+        ([_mqtt_topic_input("topic1/#")], datetime(2023, 11, 29, 4, 43, 20), datetime(2023, 11, 29, 11, 56, 40), False),
+        ([_mqtt_topic_input("topic1/+")], datetime(2023, 11, 29, 4, 43, 20), datetime(2023, 11, 29, 11, 56, 40), False),
+        ([_mqtt_topic_input("#")], None, datetime(2023, 11, 29, 11, 23, 20), False),
+        ([_mqtt_topic_input("#")], datetime(2023, 11, 29, 11, 23, 20), None, False),
+        (
+            [_mqtt_topic_input("topic1/#"), _mqtt_topic_input("topic3")],
+            datetime(2023, 11, 29, 4, 43, 20),
+            datetime(2023, 11, 29, 11, 56, 40),
+            False,
+        ),
+        ([_mqtt_topic_input("+")], None, None, False),
     ],
 )
 async def test_get_historic_events_in_time_range(
-    topics: list[str],
+    mqtt_topic_list: list[MQTTTopicInput],
     from_date: datetime,
     to_date: datetime,
     has_result_errors: bool,
 ):
-    mqtt_topic_list = [MQTTTopicInput.from_pydantic(MQTTTopic(topic=topic)) for topic in topics]
     with patch("uns_graphql.queries.historian.HistorianDBPool", return_value=mocked_db_pool):
         historian_query = HistorianQuery()
         try:
@@ -131,10 +140,9 @@ async def test_strawberry_get_historic_events_in_time_range(
     """
 
     mqtt_topics: list[dict[str, str]] = [{"topic": x} for x in topics]
-    schema = strawberry.Schema(query=HistorianQuery)
 
     with patch("uns_graphql.queries.historian.HistorianDBPool", return_value=mocked_db_pool):
-        result = await schema.execute(
+        result = await historian_schema.execute(
             query=query, variable_values={"mqtt_topics": mqtt_topics, "from_date": from_date, "to_date": to_date}
         )
         if not has_result_errors:
@@ -184,10 +192,9 @@ async def test_strawberry_get_historic_events_by_property(
             }
     """
     mqtt_topics: list[dict[str, str]] = [{"topic": x} for x in topics] if topics is not None else None
-    schema = strawberry.Schema(query=HistorianQuery)
 
     with patch("uns_graphql.queries.historian.HistorianDBPool", return_value=mocked_db_pool):
-        result = await schema.execute(
+        result = await historian_schema.execute(
             query=query,
             variable_values={
                 "properties": properties,
@@ -242,10 +249,9 @@ async def test_strawberry_get_historic_events_by_publishers(publishers, topics,
     mqtt_topics = None
     if topics is not None:
         mqtt_topics: list[dict[str, str]] = [{"topic": x} for x in topics]
-    schema = strawberry.Schema(query=HistorianQuery)
 
     with patch("uns_graphql.queries.historian.HistorianDBPool", return_value=mocked_db_pool):
-        result = await schema.execute(
+        result = await historian_schema.execute(
             query=query,
             variable_values={"publishers": publishers, "mqtt_topics": mqtt_topics, "from_date": from_date, "to_date": to_date},
         )
@@ -18,6 +18,7 @@
 """
 
 import json
+from pathlib import Path
 
 import pytest
 import strawberry
@@ -25,13 +26,8 @@ import strawberry
 from uns_graphql.type.basetype import BytesPayload, JSONPayload
 from uns_graphql.type.mqtt_event import MQTTMessage
 
-sample_spb_payload: bytes = (
-    b"\x08\xc4\x89\x89\x83\xd30\x12\x17\n\x08Inputs/A\x10\x00\x18\xea\xf2\xf5\xa8\xa0+ "
-    b"\x0bp\x00\x12\x17\n\x08Inputs/B\x10\x01\x18\xea\xf2\xf5\xa8\xa0+ \x0bp\x00\x12\x18\n\t"
-    b"Outputs/E\x10\x02\x18\xea\xf2\xf5\xa8\xa0+ \x0bp\x00\x12\x18\n\tOutputs/F\x10\x03\x18\xea\xf2\xf5\xa8\xa0+ "
-    b"\x0bp\x00\x12+\n\x18Properties/Hardware Make\x10\x04\x18\xea\xf2\xf5\xa8\xa0+ \x0cz\x04Sony\x12!\n\x11"
-    b"Properties/Weight\x10\x05\x18\xea\xf2\xf5\xa8\xa0+ \x03P\xc8\x01\x18\x00"
-)
+# serialized SparkplugB NBIRTH payload, shared by the mqtt tests
+sample_spb_payload: bytes = (Path(__file__).resolve().parents[1] / "sample_nbirth.bin").read_bytes()
 
 
 @pytest.mark.parametrize(